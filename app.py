@@ -1,12 +1,34 @@
+import concurrent.futures
+import json
 import threading
+import time
 import tkinter as tk
+from collections import OrderedDict
+from itertools import zip_longest
 from tkinter import ttk, messagebox
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
+GEOCODING_CACHE_TTL = 3600.0
+FORECAST_CACHE_TTL = 600.0
+CACHE_MAX_ENTRIES = 256
+PREFIX_CACHE_MAX_ENTRIES = 512
+
+
+def parse_json(content: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 WEATHER_CODES = {
     0: "Ciel dégagé",
@@ -53,8 +75,30 @@ class WeatherApp:
         self.suggestion_request_id = 0
         self.suppress_autocomplete = False
 
+        self._geocoding_cache: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._forecast_cache: OrderedDict[tuple[float, float], tuple[float, dict]] = OrderedDict()
+        # Les caches sont touchés par les workers du pool IO et le pool
+        # spéculatif : un verrou protège expiration et insertion.
+        self._cache_lock = threading.Lock()
+        self._prefix_cache: OrderedDict[str, list[dict]] = OrderedDict()
+
+        self.http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.http.mount("https://", adapter)
+
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="meteo-io")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
         self._build_ui()
 
+    def _on_close(self) -> None:
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
     def _build_ui(self) -> None:
         container = ttk.Frame(self.root, padding=16)
         container.pack(fill="both", expand=True)
@@ -81,7 +125,9 @@ class WeatherApp:
         self.suggestions_frame = ttk.Frame(container)
         self.suggestions_frame.pack(fill="x", pady=(0, 8))
 
-        self.suggestions_listbox = tk.Listbox(self.suggestions_frame, height=5)
+        self._listbox_var = tk.Variable(value=())
+        self._suggestions_visible = False
+        self.suggestions_listbox = tk.Listbox(self.suggestions_frame, height=5, listvariable=self._listbox_var)
         self.suggestions_listbox.pack(fill="x")
         self.suggestions_listbox.pack_forget()
         self.suggestions_listbox.bind("<<ListboxSelect>>", self._on_suggestion_select)
@@ -119,17 +165,36 @@ class WeatherApp:
         if self.selected_place and city == self._format_place_label(self.selected_place):
             selected_place = self.selected_place
 
+        speculative_place: dict | None = None
+        if selected_place is None and self.suggestion_places:
+            top_place = self.suggestion_places[0]
+            if top_place["_label"].casefold().startswith(city.casefold()):
+                speculative_place = top_place
+
         self._hide_suggestions()
         self.search_btn.config(state="disabled")
         self.status_var.set("Recherche en cours...")
 
-        thread = threading.Thread(target=self._fetch_weather_thread, args=(city, selected_place), daemon=True)
-        thread.start()
+        self._io_pool.submit(self._fetch_weather_thread, city, selected_place, speculative_place)
 
-    def _fetch_weather_thread(self, city: str, selected_place: dict | None = None) -> None:
+    def _fetch_weather_thread(
+        self,
+        city: str,
+        selected_place: dict | None = None,
+        speculative_place: dict | None = None,
+    ) -> None:
         try:
             if selected_place is not None:
                 place = selected_place
+                forecast = self._get_forecast(place["latitude"], place["longitude"])
+            elif speculative_place is not None:
+                place, forecast = self._fetch_speculative(city, speculative_place)
+                if place is None or forecast is None:
+                    self.root.after(
+                        0,
+                        lambda: self._handle_error("Aucune ville trouvée. Vérifie l’orthographe et réessaie."),
+                    )
+                    return
             else:
                 geo_data = self._get_geocoding(city)
                 if not geo_data:
@@ -139,24 +204,77 @@ class WeatherApp:
                     )
                     return
                 place = geo_data[0]
-
-            forecast = self._get_forecast(place["latitude"], place["longitude"])
+                forecast = self._get_forecast(place["latitude"], place["longitude"])
 
             self.root.after(0, lambda: self._update_ui(place, forecast))
         except Exception as exc:
             self.root.after(0, lambda: self._handle_error(f"Erreur réseau: {exc}"))
 
+    def _fetch_speculative(self, city: str, speculative_place: dict) -> tuple[dict | None, dict | None]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            forecast_future = pool.submit(
+                self._get_forecast,
+                speculative_place["latitude"],
+                speculative_place["longitude"],
+            )
+            geo_data = self._get_geocoding(city)
+            if not geo_data:
+                return None, None
+
+            place = geo_data[0]
+            same_coords = (
+                round(place["latitude"], 3) == round(speculative_place["latitude"], 3)
+                and round(place["longitude"], 3) == round(speculative_place["longitude"], 3)
+            )
+            if same_coords:
+                return place, forecast_future.result()
+
+        return place, self._get_forecast(place["latitude"], place["longitude"])
+
+    def _cache_get(self, cache: OrderedDict, key: object, ttl: float) -> object | None:
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+
+            timestamp, value = entry
+            if time.monotonic() - timestamp > ttl:
+                del cache[key]
+                return None
+
+            cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache: OrderedDict, key: object, value: object) -> None:
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+            cache.move_to_end(key)
+            while len(cache) > CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
     def _get_geocoding(self, city: str) -> list[dict]:
+        cache_key = city.strip().casefold()
+        cached = self._cache_get(self._geocoding_cache, cache_key, GEOCODING_CACHE_TTL)
+        if cached is not None:
+            return cached
+
         params = {
             "name": city,
             "count": 5,
             "language": "fr",
             "format": "json",
         }
-        response = requests.get(GEOCODING_URL, params=params, timeout=15)
+        response = self.http.get(GEOCODING_URL, params=params, timeout=4)
         response.raise_for_status()
-        data = response.json()
-        return data.get("results", [])
+        data = parse_json(response.content)
+        results = data.get("results", [])
+        for place in results:
+            name = place.get("name", "Ville")
+            admin = place.get("admin1")
+            country = place.get("country", "Pays")
+            place["_label"] = f"{name}, {admin}, {country}" if admin else f"{name}, {country}"
+        self._cache_put(self._geocoding_cache, cache_key, results)
+        return results
 
     def _on_city_input(self, *_: object) -> None:
         if self.suppress_autocomplete:
@@ -169,24 +287,62 @@ class WeatherApp:
             self.root.after_cancel(self.suggestion_job)
             self.suggestion_job = None
 
-        if len(query) < 2:
+        # Même seuil que la version Web : 3 caractères, sauf nom composé.
+        if len(query) < 3 and " " not in query:
             self._hide_suggestions()
             return
 
         self.suggestion_request_id += 1
         request_id = self.suggestion_request_id
+
+        cached_places = self._filter_prefix_cache(query)
+        if cached_places is not None:
+            self._show_suggestions(query, request_id, cached_places)
+            return
+
         self.suggestion_job = self.root.after(300, lambda: self._load_suggestions(query, request_id))
 
+    def _filter_prefix_cache(self, query: str) -> list[dict] | None:
+        query_cf = query.casefold()
+        places = self._prefix_cache.get(query_cf)
+        if places is not None:
+            self._prefix_cache.move_to_end(query_cf)
+            return places
+
+        for length in range(len(query_cf) - 1, 1, -1):
+            prefix = query_cf[:length]
+            cached = self._prefix_cache.get(prefix)
+            if cached is None:
+                continue
+            matches = [
+                place
+                for place in cached
+                if str(place.get("name", "")).casefold().startswith(query_cf)
+            ]
+            if len(matches) >= 3:
+                self._prefix_cache.move_to_end(prefix)
+                return matches
+
+        return None
+
     def _load_suggestions(self, query: str, request_id: int) -> None:
-        thread = threading.Thread(target=self._load_suggestions_thread, args=(query, request_id), daemon=True)
-        thread.start()
+        self._io_pool.submit(self._load_suggestions_thread, query, request_id)
 
     def _load_suggestions_thread(self, query: str, request_id: int) -> None:
         try:
             places = self._get_geocoding(query)
-            self.root.after(0, lambda: self._show_suggestions(query, request_id, places))
         except Exception:
-            self.root.after(0, self._hide_suggestions)
+            self.root.after_idle(self._on_suggestion_failure)
+            return
+
+        if request_id != self.suggestion_request_id:
+            return
+
+        self.root.after_idle(lambda: self._show_suggestions(query, request_id, places))
+
+    def _on_suggestion_failure(self) -> None:
+        self._hide_suggestions()
+        self._handle_transient_error("Suggestions indisponibles pour le moment.")
 
     def _show_suggestions(self, query: str, request_id: int, places: list[dict]) -> None:
         current_value = self.city_var.get().strip()
@@ -197,13 +353,18 @@ class WeatherApp:
             self._hide_suggestions()
             return
 
+        query_cf = query.casefold()
+        self._prefix_cache[query_cf] = places
+        self._prefix_cache.move_to_end(query_cf)
+        while len(self._prefix_cache) > PREFIX_CACHE_MAX_ENTRIES:
+            self._prefix_cache.popitem(last=False)
+
         self.suggestion_places = places
-        self.suggestions_listbox.delete(0, tk.END)
-        for place in places:
-            self.suggestions_listbox.insert(tk.END, self._format_place_label(place))
+        self._listbox_var.set(tuple(place["_label"] for place in places))
 
-        if not self.suggestions_listbox.winfo_ismapped():
+        if not self._suggestions_visible:
             self.suggestions_listbox.pack(fill="x")
+            self._suggestions_visible = True
 
     def _focus_suggestions(self, event: tk.Event) -> str | None:
         if not self.suggestion_places:
@@ -240,18 +401,28 @@ class WeatherApp:
 
     def _hide_suggestions(self) -> None:
         self.suggestion_places = []
-        self.suggestions_listbox.delete(0, tk.END)
+        self._listbox_var.set(())
         self.suggestions_listbox.pack_forget()
+        self._suggestions_visible = False
 
     def _format_place_label(self, place: dict) -> str:
+        label = place.get("_label")
+        if label is not None:
+            return label
+
         name = place.get("name", "Ville")
         admin = place.get("admin1")
         country = place.get("country", "Pays")
-        if admin:
-            return f"{name}, {admin}, {country}"
-        return f"{name}, {country}"
+        label = f"{name}, {admin}, {country}" if admin else f"{name}, {country}"
+        place["_label"] = label
+        return label
 
     def _get_forecast(self, latitude: float, longitude: float) -> dict:
+        cache_key = (round(latitude, 3), round(longitude, 3))
+        cached = self._cache_get(self._forecast_cache, cache_key, FORECAST_CACHE_TTL)
+        if cached is not None:
+            return cached
+
         params = {
             "latitude": latitude,
             "longitude": longitude,
@@ -260,9 +431,11 @@ class WeatherApp:
             "timezone": "auto",
             "forecast_days": 5,
         }
-        response = requests.get(FORECAST_URL, params=params, timeout=15)
+        response = self.http.get(FORECAST_URL, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        forecast = parse_json(response.content)
+        self._cache_put(self._forecast_cache, cache_key, forecast)
+        return forecast
 
     def _update_ui(self, place: dict, forecast: dict) -> None:
         current = forecast.get("current", {})
@@ -283,24 +456,23 @@ class WeatherApp:
             f"Vent: {current.get('wind_speed_10m', 'N/A')} km/h"
         )
 
-        lines = []
         dates = daily.get("time", [])
         max_temps = daily.get("temperature_2m_max", [])
         min_temps = daily.get("temperature_2m_min", [])
         precip = daily.get("precipitation_probability_max", [])
         codes = daily.get("weather_code", [])
 
-        for index, date_str in enumerate(dates):
-            raw_code = codes[index] if index < len(codes) else None
-            code = raw_code if isinstance(raw_code, int) else -1
-            weather_day = WEATHER_CODES.get(code, "Description indisponible")
-            max_temp = max_temps[index] if index < len(max_temps) else "N/A"
-            min_temp = min_temps[index] if index < len(min_temps) else "N/A"
-            rain = precip[index] if index < len(precip) else "N/A"
-            lines.append(
-                f"• {date_str}  |  {weather_day}\n"
-                f"  Temp: {min_temp}°C → {max_temp}°C  |  Pluie: {rain}%"
+        weather_for_code = WEATHER_CODES.get
+        lines = [
+            f"• {date_str}  |  {weather_for_code(raw_code if isinstance(raw_code, int) else -1, 'Description indisponible')}\n"
+            f"  Temp: {min_temp if min_temp is not None else 'N/A'}°C → "
+            f"{max_temp if max_temp is not None else 'N/A'}°C  |  "
+            f"Pluie: {rain if rain is not None else 'N/A'}%"
+            for date_str, raw_code, max_temp, min_temp, rain in zip_longest(
+                dates, codes, max_temps, min_temps, precip, fillvalue=None
             )
+            if date_str is not None
+        ]
 
         self.location_var.set(location)
         self.current_var.set(current_text)
@@ -313,6 +485,10 @@ class WeatherApp:
         self.status_var.set("Météo mise à jour.")
         self.search_btn.config(state="normal")
 
+    def _handle_transient_error(self, message: str) -> None:
+        # Erreur passagère (autocomplete): pas de boîte modale qui bloque la boucle Tk.
+        self.status_var.set(message)
+
     def _handle_error(self, message: str) -> None:
         self.search_btn.config(state="normal")
         self.status_var.set("Échec de la récupération météo.")
@@ -0,0 +1,17 @@
+"""Configuration gunicorn pour la version Web (web_app.py).
+
+Lancement : gunicorn -c gunicorn_conf.py web_app:app
+
+L'application passe son temps à attendre Open-Meteo : des workers
+threadés (gthread) absorbent les attentes réseau concurrentes, comme
+pour le Dockerfile de sondage_clone.
+"""
+
+import os
+
+bind = "0.0.0.0:" + os.environ.get("PORT", "5000")
+worker_class = "gthread"
+workers = (os.cpu_count() or 1) * 2 + 1
+threads = 4
+keepalive = 30
+timeout = 30
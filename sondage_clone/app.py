@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import hmac
+import pickle
+import queue
 import re
 import smtplib
 import os
 import secrets
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
 from pathlib import Path
 
@@ -20,7 +28,26 @@ BASE_DIR = Path(__file__).resolve().parent
 
 def _load_local_env_file() -> None:
     env_candidates = [BASE_DIR / ".env.local", BASE_DIR / ".env"]
+    cache_path = BASE_DIR / ".env.cache"
 
+    mtimes = tuple(
+        env_path.stat().st_mtime_ns if env_path.exists() else None
+        for env_path in env_candidates
+    )
+
+    if cache_path.exists():
+        try:
+            with cache_path.open("rb") as handle:
+                cached_mtimes, env_values = pickle.load(handle)
+        except Exception:
+            cached_mtimes, env_values = None, None
+        if cached_mtimes == mtimes and isinstance(env_values, dict):
+            for env_key, env_value in env_values.items():
+                if env_key not in os.environ:
+                    os.environ[env_key] = env_value
+            return
+
+    env_values = {}
     for env_path in env_candidates:
         if not env_path.exists():
             continue
@@ -32,12 +59,38 @@ def _load_local_env_file() -> None:
             key, value = line.split("=", 1)
             env_key = key.strip()
             env_value = value.strip().strip('"').strip("'")
-            if env_key and env_key not in os.environ:
-                os.environ[env_key] = env_value
+            if env_key:
+                env_values.setdefault(env_key, env_value)
+
+    for env_key, env_value in env_values.items():
+        if env_key not in os.environ:
+            os.environ[env_key] = env_value
+
+    try:
+        with cache_path.open("wb") as handle:
+            pickle.dump((mtimes, env_values), handle, protocol=5)
+    except OSError:
+        pass
 
 
 _load_local_env_file()
 
+
+@functools.lru_cache(maxsize=None)
+def _env(key: str, default: str | None = None) -> str | None:
+    return os.environ.get(key, default)
+
+
+@functools.lru_cache(maxsize=4096)
+def admin_session_key(poll_id: int) -> str:
+    return f"admin_poll_{poll_id}"
+
+
+@functools.lru_cache(maxsize=4096)
+def voter_session_key(poll_id: int) -> str:
+    return f"voter_poll_{poll_id}"
+
+
 DB_PATH = Path(os.environ.get("SONDAGE_DB_PATH", str(BASE_DIR / "sondage.db")))
 
 ALLOWED_CHOICES = {"yes", "no"}
@@ -83,22 +136,162 @@ FEEDBACK_STATUS_LABELS = {
     "resolved": "Résolu",
     "closed": "Clôturé",
 }
-EMAIL_REGEX = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+# \Z plutôt que $ : pas de retour arrière pour tolérer un \n final,
+# et re.ASCII évite les tables Unicode pour \s.
+EMAIL_REGEX = re.compile(r"[^\s@]+@[^\s@]+\.[^\s@]+\Z", re.ASCII)
+_EMAIL_FINDALL = re.compile(r"[^\s@,;<>]+@[^\s@,;<>]+\.[^\s@,;<>]+")
+_parse_iso_cached = functools.lru_cache(maxsize=8192)(datetime.fromisoformat)
 DEFAULT_CONSENT_VERSION = "v1.0-2026-02-15"
 
+_PUBLIC_ENDPOINTS = frozenset(
+    {
+        "auth_login",
+        "auth_register",
+        "auth_forgot_password",
+        "auth_set_password",
+        "privacy_policy",
+        "legal_notice",
+        "view_poll",
+        "vote",
+        "vote_status",
+        "feedback_submit",
+        "admin_login",
+        "admin_logout",
+        "static",
+    }
+)
+
+_MISSING = object()
+
+SCHEMA_VERSION = 4
+
+DB_POOL_SIZE = 4
+
+MY_POLLS_PAGE_SIZE = 50
+
+_db_pool: queue.Queue = queue.Queue(maxsize=DB_POOL_SIZE)
+
+# Les vérifications de doublon partagent le même texte SQL dans vote et
+# vote_status : le cache de requêtes préparées de sqlite3 les réutilise.
+SQL_VOTE_EXISTS_BY_EMAIL = "SELECT 1 FROM votes WHERE poll_id = ? AND participant_email = ? LIMIT 1"
+SQL_VOTE_EXISTS_BY_NAME = (
+    "SELECT 1 FROM votes"
+    " WHERE poll_id = ? AND COALESCE(participant_email, '') = ''"
+    " AND participant_name = ? COLLATE NOCASE LIMIT 1"
+)
+SQL_POLL_HAS_VOTES = "SELECT 1 FROM votes WHERE poll_id = ? LIMIT 1"
+SQL_VOTE_UPSERT = (
+    "INSERT INTO votes (poll_id, slot_id, participant_name, participant_email, choice, comment,"
+    " rgpd_vote_consent_at, rgpd_consent_version, created_at)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(poll_id, slot_id,"
+    " CASE WHEN COALESCE(participant_email, '') <> '' THEN LOWER(participant_email)"
+    " ELSE 'name:' || LOWER(participant_name) END)"
+    " DO UPDATE SET"
+    " participant_name = excluded.participant_name,"
+    " choice = excluded.choice,"
+    " comment = excluded.comment,"
+    " rgpd_vote_consent_at = excluded.rgpd_vote_consent_at,"
+    " rgpd_consent_version = excluded.rgpd_consent_version,"
+    " created_at = excluded.created_at"
+)
+SQL_VOTE_EXISTS_ANY = (
+    "SELECT EXISTS("
+    " SELECT 1 FROM votes"
+    " WHERE poll_id = ?"
+    "   AND ((? <> '' AND participant_email = ?)"
+    "        OR (? = '' AND COALESCE(participant_email, '') = ''"
+    "            AND participant_name = ? COLLATE NOCASE)))"
+)
+
+
+def _new_db_connection() -> sqlite3.Connection:
+    # isolation_level=None : autocommit réel, les transactions multi-
+    # requêtes sont ouvertes explicitement par BEGIN IMMEDIATE.
+    connection = sqlite3.connect(
+        DB_PATH, check_same_thread=False, cached_statements=256, isolation_level=None
+    )
+    connection.row_factory = sqlite3.Row
+    connection.executescript(
+        """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=134217728;
+        PRAGMA cache_size=-20000;
+        PRAGMA busy_timeout=5000;
+        PRAGMA foreign_keys=ON;
+        """
+    )
+    return connection
+
+
+def _checkout_db_connection() -> sqlite3.Connection:
+    try:
+        return _db_pool.get_nowait()
+    except queue.Empty:
+        return _new_db_connection()
+
+
+def _return_db_connection(connection: sqlite3.Connection) -> None:
+    try:
+        connection.rollback()
+        _db_pool.put_nowait(connection)
+    except (queue.Full, sqlite3.Error):
+        connection.close()
+
+
+POLL_CACHE_TTL = 60.0
+
+_poll_cache: dict[str, tuple[float, dict]] = {}
+_slots_cache: dict[int, tuple[float, list[dict]]] = {}
+_poll_cache_lock = threading.Lock()
+
+_summary_cache: dict[int, tuple[int, list[dict]]] = {}
+_summary_cache_lock = threading.Lock()
+
+USER_CACHE_TTL = 30.0
+
+_user_cache: dict[int, tuple[float, dict]] = {}
+_user_cache_lock = threading.Lock()
+
+AUTH_VERIFY_TTL = 60.0
+AUTH_VERIFY_MAX_ENTRIES = 1024
+
+_auth_verify_cache: dict[tuple[int, bytes], float] = {}
+_auth_verify_cache_lock = threading.Lock()
+
+_STATIC_SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "SAMEORIGIN"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=(), payment=(), usb=()"),
+    ("Content-Security-Policy", "default-src 'self'; base-uri 'self'; form-action 'self'; frame-ancestors 'self'; style-src 'self' https://fonts.googleapis.com; font-src 'self' https://fonts.gstatic.com; script-src 'self'; img-src 'self' data:;"),
+)
+
+ADMIN_LOGIN_WINDOW_SECONDS = 60.0
+ADMIN_LOGIN_MAX_ATTEMPTS = 5
+
+_admin_login_attempts: dict[int, deque[float]] = defaultdict(lambda: deque(maxlen=10))
+_admin_login_attempts_lock = threading.Lock()
+
+# L'envoi SMTP se fait hors du fil de la requête : la réponse HTTP ne
+# dépend plus des allers-retours réseau vers le serveur mail.
+_mail_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="sondage-mail")
+
 
 def create_app() -> Flask:
     app = Flask(__name__)
-    secret_key = os.environ.get("SONDAGE_SECRET_KEY", "change-me-in-production")
+    secret_key = _env("SONDAGE_SECRET_KEY", "change-me-in-production")
     app.config["SECRET_KEY"] = secret_key
     app.config["SESSION_COOKIE_HTTPONLY"] = True
-    cookie_samesite = os.environ.get("SONDAGE_COOKIE_SAMESITE", "Lax").strip().title()
+    cookie_samesite = _env("SONDAGE_COOKIE_SAMESITE", "Lax").strip().title()
     if cookie_samesite not in {"Lax", "Strict", "None"}:
         cookie_samesite = "Lax"
     app.config["SESSION_COOKIE_SAMESITE"] = cookie_samesite
-    app.config["SESSION_COOKIE_SECURE"] = os.environ.get("SONDAGE_COOKIE_SECURE", "0") == "1"
+    app.config["SESSION_COOKIE_SECURE"] = _env("SONDAGE_COOKIE_SECURE", "0") == "1"
     app.config["SESSION_COOKIE_NAME"] = "sondage_session"
-    session_timeout_raw = os.environ.get("SONDAGE_SESSION_TIMEOUT_MINUTES", "720").strip()
+    session_timeout_raw = _env("SONDAGE_SESSION_TIMEOUT_MINUTES", "720").strip()
     try:
         session_timeout_minutes = int(session_timeout_raw)
     except ValueError:
@@ -111,24 +304,24 @@ def create_app() -> Flask:
     if secret_key == "change-me-in-production":
         app.logger.warning("SONDAGE_SECRET_KEY utilise une valeur par défaut: change-la en production.")
 
-    auth_enabled = os.environ.get("SONDAGE_AUTH_ENABLED", "0") == "1"
-    auth_allow_registration = os.environ.get("SONDAGE_AUTH_ALLOW_REGISTRATION", "1") == "1"
-    bootstrap_admin_email = os.environ.get("SONDAGE_BOOTSTRAP_ADMIN_EMAIL", "").strip().lower()
-    consent_version = os.environ.get("SONDAGE_CONSENT_VERSION", DEFAULT_CONSENT_VERSION).strip() or DEFAULT_CONSENT_VERSION
-
-    smtp_host = os.environ.get("SMTP_HOST", "").strip()
-    smtp_port = int(os.environ.get("SMTP_PORT", "587"))
-    smtp_user = os.environ.get("SMTP_USER", "").strip()
-    smtp_password = os.environ.get("SMTP_PASS", "")
-    smtp_use_tls = os.environ.get("SMTP_USE_TLS", "1") == "1"
-    smtp_use_ssl = os.environ.get("SMTP_USE_SSL", "0") == "1"
-    smtp_from_email = os.environ.get("SMTP_FROM_EMAIL", smtp_user).strip()
-    smtp_from_name = os.environ.get("SMTP_FROM_NAME", "Sondage-noschoixpourvous").strip() or "Sondage-noschoixpourvous"
-    feedback_to_email = os.environ.get("FEEDBACK_TO_EMAIL", smtp_from_email).strip().lower()
-    legal_publisher_name = os.environ.get("LEGAL_PUBLISHER_NAME", "TKONSULTING").strip() or "TKONSULTING"
-    legal_siren_siret = os.environ.get("LEGAL_SIREN_SIRET", "948370317").strip() or "948370317"
-    legal_contact_email = os.environ.get("LEGAL_CONTACT_EMAIL", smtp_from_email).strip() or smtp_from_email or "-"
-    password_reset_ttl_hours_raw = os.environ.get("SONDAGE_PASSWORD_RESET_TTL_HOURS", "48").strip()
+    auth_enabled = _env("SONDAGE_AUTH_ENABLED", "0") == "1"
+    auth_allow_registration = _env("SONDAGE_AUTH_ALLOW_REGISTRATION", "1") == "1"
+    bootstrap_admin_email = _env("SONDAGE_BOOTSTRAP_ADMIN_EMAIL", "").strip().lower()
+    consent_version = _env("SONDAGE_CONSENT_VERSION", DEFAULT_CONSENT_VERSION).strip() or DEFAULT_CONSENT_VERSION
+
+    smtp_host = _env("SMTP_HOST", "").strip()
+    smtp_port = int(_env("SMTP_PORT", "587"))
+    smtp_user = _env("SMTP_USER", "").strip()
+    smtp_password = _env("SMTP_PASS", "")
+    smtp_use_tls = _env("SMTP_USE_TLS", "1") == "1"
+    smtp_use_ssl = _env("SMTP_USE_SSL", "0") == "1"
+    smtp_from_email = _env("SMTP_FROM_EMAIL", smtp_user).strip()
+    smtp_from_name = _env("SMTP_FROM_NAME", "Sondage-noschoixpourvous").strip() or "Sondage-noschoixpourvous"
+    feedback_to_email = _env("FEEDBACK_TO_EMAIL", smtp_from_email).strip().lower()
+    legal_publisher_name = _env("LEGAL_PUBLISHER_NAME", "TKONSULTING").strip() or "TKONSULTING"
+    legal_siren_siret = _env("LEGAL_SIREN_SIRET", "948370317").strip() or "948370317"
+    legal_contact_email = _env("LEGAL_CONTACT_EMAIL", smtp_from_email).strip() or smtp_from_email or "-"
+    password_reset_ttl_hours_raw = _env("SONDAGE_PASSWORD_RESET_TTL_HOURS", "48").strip()
     try:
         password_reset_ttl_hours = int(password_reset_ttl_hours_raw)
     except ValueError:
@@ -136,37 +329,113 @@ def create_app() -> Flask:
     password_reset_ttl_hours = max(1, min(168, password_reset_ttl_hours))
 
     def parse_email_list(raw: str) -> list[str]:
-        parts = re.split(r"[\n,;]+", raw)
-        emails: list[str] = []
-        seen: set[str] = set()
-        for part in parts:
-            email = part.strip().lower()
-            if not email:
-                continue
-            if not EMAIL_REGEX.match(email):
-                continue
-            if email in seen:
-                continue
-            seen.add(email)
-            emails.append(email)
-        return emails
+        # Re-filtré par EMAIL_REGEX : findall extrait des candidats, la
+        # validation finale reste la même que pour un email saisi seul.
+        return list(
+            dict.fromkeys(
+                match.lower() for match in _EMAIL_FINDALL.findall(raw) if EMAIL_REGEX.match(match)
+            )
+        )
+
+    smtp_configured = bool(smtp_host and smtp_from_email)
 
-    def smtp_configured() -> bool:
-        return bool(smtp_host and smtp_from_email)
+    smtp_state: dict = {"server": None}
+    smtp_lock = threading.Lock()
+
+    def _drop_smtp() -> None:
+        server = smtp_state["server"]
+        smtp_state["server"] = None
+        if server is not None:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _connect_smtp() -> smtplib.SMTP | None:
+        try:
+            smtp_client = smtplib.SMTP_SSL if smtp_use_ssl else smtplib.SMTP
+            server = smtp_client(smtp_host, smtp_port, timeout=20)
+            if smtp_use_tls and not smtp_use_ssl:
+                server.starttls()
+            if smtp_user and smtp_password:
+                server.login(smtp_user, smtp_password)
+        except Exception as exc:
+            app.logger.exception("Erreur connexion SMTP: %s", exc)
+            return None
+        return server
+
+    def _acquire_smtp() -> smtplib.SMTP | None:
+        # Réutilise la connexion SMTP du processus (TLS + AUTH payés une fois),
+        # vérifiée par un NOOP et reconnectée si elle est morte. Appeler sous smtp_lock.
+        server = smtp_state["server"]
+        if server is not None:
+            try:
+                status, _ = server.noop()
+                if status < 400:
+                    return server
+            except Exception:
+                pass
+            _drop_smtp()
+
+        server = _connect_smtp()
+        smtp_state["server"] = server
+        return server
+
+    def invalidate_auth_verify_cache(user_id: int) -> None:
+        with _auth_verify_cache_lock:
+            for key in [key for key in _auth_verify_cache if key[0] == user_id]:
+                del _auth_verify_cache[key]
+
+    def verify_user_password(user: dict, password: str) -> bool:
+        # Un rechargement juste après connexion ne repaie pas la KDF
+        # complète : on mémorise brièvement les vérifications réussies.
+        key = (user["id"], hashlib.sha256(password.encode()).digest())
+        now = time.monotonic()
+        with _auth_verify_cache_lock:
+            stamp = _auth_verify_cache.get(key)
+            if stamp is not None and now - stamp < AUTH_VERIFY_TTL:
+                return True
+        if not check_password_hash(user["password_hash"], password):
+            return False
+        with _auth_verify_cache_lock:
+            if len(_auth_verify_cache) >= AUTH_VERIFY_MAX_ENTRIES:
+                _auth_verify_cache.clear()
+            _auth_verify_cache[key] = now
+        return True
+
+    def invalidate_user_cache(user_id: int) -> None:
+        with _user_cache_lock:
+            _user_cache.pop(user_id, None)
+
+    def get_user_by_id(user_id: int) -> dict | None:
+        now = time.monotonic()
+        with _user_cache_lock:
+            entry = _user_cache.get(user_id)
+            if entry is not None and now - entry[0] <= USER_CACHE_TTL:
+                return entry[1]
 
-    def get_user_by_id(user_id: int) -> sqlite3.Row | None:
         db = get_db()
-        return db.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        row = db.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+
+        user = dict(row)
+        with _user_cache_lock:
+            _user_cache[user_id] = (now, user)
+        return user
 
     def get_user_by_email(email: str) -> sqlite3.Row | None:
         db = get_db()
         return db.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
 
-    def get_current_user() -> sqlite3.Row | None:
-        cached = g.get("current_user")
-        if cached is not None:
+    def get_current_user() -> dict | None:
+        # Sentinelle : le résultat négatif est mémorisé aussi, pour que les
+        # appels répétés d'une même requête ne refassent aucun travail.
+        cached = g.get("current_user", _MISSING)
+        if cached is not _MISSING:
             return cached
 
+        g.current_user = None
         raw_user_id = session.get("app_user_id")
         if not raw_user_id:
             return None
@@ -193,7 +462,7 @@ def create_app() -> Flask:
         db = get_db()
         source_ip = (request.headers.get("X-Forwarded-For", "") or "").split(",")[0].strip() or (request.remote_addr or "")
         user_agent = request.headers.get("User-Agent", "")[:250]
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db.execute(
             """
             INSERT INTO auth_consent_events (user_id, event_type, consent_version, consent_at, source_ip, user_agent, created_at)
@@ -208,41 +477,48 @@ def create_app() -> Flask:
     def send_poll_invitations(recipients: list[str], poll_title: str, poll_url: str, creator_name: str) -> tuple[int, int, list[str]]:
         if not recipients:
             return 0, 0, []
-        if not smtp_configured():
+        if not smtp_configured:
             return 0, len(recipients), recipients
 
         sender_display = f"{smtp_from_name} <{smtp_from_email}>"
         sender_label = creator_name or "L'organisateur"
         failed: list[str] = []
         sent_count = 0
+        max_failures = max(1, len(recipients) // 3)
 
-        try:
-            smtp_client = smtplib.SMTP_SSL if smtp_use_ssl else smtplib.SMTP
-            with smtp_client(smtp_host, smtp_port, timeout=20) as server:
-                if smtp_use_tls and not smtp_use_ssl:
-                    server.starttls()
-                if smtp_user and smtp_password:
-                    server.login(smtp_user, smtp_password)
-
-                for email in recipients:
-                    message = EmailMessage()
-                    message["Subject"] = f"Invitation sondage : {poll_title}"
-                    message["From"] = sender_display
-                    message["To"] = email
-                    message.set_content(
-                        f"Bonjour,\n\n"
-                        f"{sender_label} t'invite à participer au sondage : {poll_title}\n\n"
-                        f"Lien : {poll_url}\n\n"
-                        f"Merci.\n"
-                    )
-                    try:
-                        server.send_message(message)
-                        sent_count += 1
-                    except Exception:
-                        failed.append(email)
-        except Exception as exc:
-            app.logger.exception("Erreur envoi SMTP: %s", exc)
-            return 0, len(recipients), recipients
+        # Le corps et les entêtes sont identiques pour tous les destinataires,
+        # seul To: change : on sérialise le message une fois.
+        message = EmailMessage()
+        message["Subject"] = f"Invitation sondage : {poll_title}"
+        message["From"] = sender_display
+        message["To"] = recipients[0]
+        message.set_content(
+            f"Bonjour,\n\n"
+            f"{sender_label} t'invite à participer au sondage : {poll_title}\n\n"
+            f"Lien : {poll_url}\n\n"
+            f"Merci.\n"
+        )
+
+        with smtp_lock:
+            server = _acquire_smtp()
+            if server is None:
+                return 0, len(recipients), recipients
+
+            for index, email in enumerate(recipients):
+                message.replace_header("To", email)
+                try:
+                    server.send_message(message)
+                    sent_count += 1
+                except smtplib.SMTPServerDisconnected as exc:
+                    app.logger.exception("Erreur envoi SMTP: %s", exc)
+                    _drop_smtp()
+                    failed.extend(recipients[index:])
+                    break
+                except Exception:
+                    failed.append(email)
+                    if len(failed) > max_failures:
+                        failed.extend(recipients[index + 1:])
+                        break
 
         return sent_count, len(failed), failed
 
@@ -253,11 +529,12 @@ def create_app() -> Flask:
         sender_email: str,
         page_url: str,
     ) -> bool:
-        if not smtp_configured() or not feedback_to_email:
+        if not smtp_configured or not feedback_to_email:
             return False
 
         sender_display = f"{smtp_from_name} <{smtp_from_email}>"
         component_label = component or "other"
+        # Appelé depuis le pool mail, donc hors contexte de requête.
         feedback_time = datetime.utcnow().isoformat(timespec="seconds")
 
         message = EmailMessage()
@@ -273,24 +550,23 @@ def create_app() -> Flask:
             f"Message:\n{message_text}\n"
         )
 
-        try:
-            smtp_client = smtplib.SMTP_SSL if smtp_use_ssl else smtplib.SMTP
-            with smtp_client(smtp_host, smtp_port, timeout=20) as server:
-                if smtp_use_tls and not smtp_use_ssl:
-                    server.starttls()
-                if smtp_user and smtp_password:
-                    server.login(smtp_user, smtp_password)
+        with smtp_lock:
+            server = _acquire_smtp()
+            if server is None:
+                return False
+            try:
                 server.send_message(message)
-            return True
-        except Exception as exc:
-            app.logger.exception("Erreur envoi feedback SMTP: %s", exc)
-            return False
+                return True
+            except Exception as exc:
+                app.logger.exception("Erreur envoi feedback SMTP: %s", exc)
+                _drop_smtp()
+                return False
 
     def hash_password_reset_token(raw_token: str) -> str:
         return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
 
     def send_password_reset_email(recipient_email: str, reset_url: str, expires_at: str) -> bool:
-        if not smtp_configured():
+        if not smtp_configured:
             return False
 
         sender_display = f"{smtp_from_name} <{smtp_from_email}>"
@@ -306,18 +582,22 @@ def create_app() -> Flask:
             f"Si tu n'es pas à l'origine de cette demande, tu peux ignorer ce message.\n"
         )
 
+        # Envoyé dans le chemin de la requête : une connexion dédiée évite
+        # d'attendre le verrou SMTP détenu par un lot d'invitations en cours.
+        server = _connect_smtp()
+        if server is None:
+            return False
         try:
-            smtp_client = smtplib.SMTP_SSL if smtp_use_ssl else smtplib.SMTP
-            with smtp_client(smtp_host, smtp_port, timeout=20) as server:
-                if smtp_use_tls and not smtp_use_ssl:
-                    server.starttls()
-                if smtp_user and smtp_password:
-                    server.login(smtp_user, smtp_password)
-                server.send_message(message)
+            server.send_message(message)
             return True
         except Exception as exc:
             app.logger.exception("Erreur envoi email reset mot de passe: %s", exc)
             return False
+        finally:
+            try:
+                server.quit()
+            except Exception:
+                pass
 
     def save_feedback(
         component: str,
@@ -328,7 +608,7 @@ def create_app() -> Flask:
         submitted_by_user_id: int | None,
     ) -> None:
         db = get_db()
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db.execute(
             """
             INSERT INTO feedbacks (component, message, sender_name, sender_email, page_url, submitted_by_user_id, status, status_updated_at, created_at)
@@ -350,186 +630,229 @@ def create_app() -> Flask:
 
     def get_db() -> sqlite3.Connection:
         if "db" not in g:
-            connection = sqlite3.connect(DB_PATH)
-            connection.row_factory = sqlite3.Row
-            g.db = connection
+            g.db = _checkout_db_connection()
         return g.db
 
     @app.teardown_appcontext
     def close_db(_: object) -> None:
         connection = g.pop("db", None)
         if connection is not None:
-            connection.close()
+            _return_db_connection(connection)
 
     def init_db() -> None:
         db = get_db()
-        db.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS polls (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                token TEXT UNIQUE NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                creator_name TEXT,
-                created_by_user_id INTEGER,
-                poll_type TEXT NOT NULL DEFAULT 'meeting',
-                response_mode TEXT NOT NULL DEFAULT 'availability',
-                deadline_at TEXT,
-                archived_at TEXT,
-                archived_by_user_id INTEGER,
-                organizer_code_hash TEXT,
-                rgpd_creator_consent_at TEXT,
-                rgpd_consent_version TEXT,
-                rgpd_email_rights_confirmed INTEGER NOT NULL DEFAULT 0,
-                rgpd_email_rights_confirmed_at TEXT,
-                created_at TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS slots (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                poll_id INTEGER NOT NULL,
-                label TEXT NOT NULL,
-                position INTEGER NOT NULL,
-                FOREIGN KEY (poll_id) REFERENCES polls (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS votes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                poll_id INTEGER NOT NULL,
-                slot_id INTEGER NOT NULL,
-                participant_name TEXT NOT NULL,
-                participant_email TEXT,
-                choice TEXT NOT NULL,
-                comment TEXT,
-                rgpd_vote_consent_at TEXT,
-                rgpd_consent_version TEXT,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (poll_id) REFERENCES polls (id),
-                FOREIGN KEY (slot_id) REFERENCES slots (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                is_admin INTEGER NOT NULL DEFAULT 0,
-                consent_auth_at TEXT,
-                consent_auth_version TEXT,
-                created_at TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS feedbacks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                component TEXT NOT NULL,
-                message TEXT NOT NULL,
-                sender_name TEXT,
-                sender_email TEXT,
-                page_url TEXT,
-                submitted_by_user_id INTEGER,
-                status TEXT NOT NULL DEFAULT 'new',
-                status_updated_at TEXT,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (submitted_by_user_id) REFERENCES users (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS auth_consent_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                event_type TEXT NOT NULL,
-                consent_version TEXT,
-                consent_at TEXT NOT NULL,
-                source_ip TEXT,
-                user_agent TEXT,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            );
-
-            CREATE TABLE IF NOT EXISTS user_password_reset_tokens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                token_hash TEXT NOT NULL UNIQUE,
-                created_at TEXT NOT NULL,
-                expires_at TEXT NOT NULL,
-                used_at TEXT,
-                sent_by_admin_user_id INTEGER,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (sent_by_admin_user_id) REFERENCES users (id)
-            );
-            """
-        )
 
-        poll_columns = {
-            row["name"]
-            for row in db.execute("PRAGMA table_info(polls)").fetchall()
-        }
-        if "poll_type" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN poll_type TEXT NOT NULL DEFAULT 'meeting'")
-        if "created_by_user_id" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN created_by_user_id INTEGER")
-        if "response_mode" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN response_mode TEXT NOT NULL DEFAULT 'availability'")
-        if "deadline_at" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN deadline_at TEXT")
-        if "archived_at" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN archived_at TEXT")
-        if "archived_by_user_id" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN archived_by_user_id INTEGER")
-        if "organizer_code_hash" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN organizer_code_hash TEXT")
-        if "rgpd_creator_consent_at" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN rgpd_creator_consent_at TEXT")
-        if "rgpd_consent_version" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN rgpd_consent_version TEXT")
-        if "rgpd_email_rights_confirmed" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN rgpd_email_rights_confirmed INTEGER NOT NULL DEFAULT 0")
-        if "rgpd_email_rights_confirmed_at" not in poll_columns:
-            db.execute("ALTER TABLE polls ADD COLUMN rgpd_email_rights_confirmed_at TEXT")
-
-        vote_columns = {
-            row["name"]
-            for row in db.execute("PRAGMA table_info(votes)").fetchall()
-        }
-        if "participant_email" not in vote_columns:
-            db.execute("ALTER TABLE votes ADD COLUMN participant_email TEXT")
-        if "comment" not in vote_columns:
-            db.execute("ALTER TABLE votes ADD COLUMN comment TEXT")
-        if "rgpd_vote_consent_at" not in vote_columns:
-            db.execute("ALTER TABLE votes ADD COLUMN rgpd_vote_consent_at TEXT")
-        if "rgpd_consent_version" not in vote_columns:
-            db.execute("ALTER TABLE votes ADD COLUMN rgpd_consent_version TEXT")
-
-        user_columns = {
-            row["name"]
-            for row in db.execute("PRAGMA table_info(users)").fetchall()
-        }
-        if "is_active" not in user_columns:
-            db.execute("ALTER TABLE users ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
-        if "is_admin" not in user_columns:
-            db.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER NOT NULL DEFAULT 0")
-        if "consent_auth_at" not in user_columns:
-            db.execute("ALTER TABLE users ADD COLUMN consent_auth_at TEXT")
-        if "consent_auth_version" not in user_columns:
-            db.execute("ALTER TABLE users ADD COLUMN consent_auth_version TEXT")
-
-        feedback_columns = {
-            row["name"]
-            for row in db.execute("PRAGMA table_info(feedbacks)").fetchall()
-        }
-        if "submitted_by_user_id" not in feedback_columns:
-            db.execute("ALTER TABLE feedbacks ADD COLUMN submitted_by_user_id INTEGER")
-        if "status" not in feedback_columns:
-            db.execute("ALTER TABLE feedbacks ADD COLUMN status TEXT NOT NULL DEFAULT 'new'")
-        if "status_updated_at" not in feedback_columns:
-            db.execute("ALTER TABLE feedbacks ADD COLUMN status_updated_at TEXT")
-            db.execute("UPDATE feedbacks SET status_updated_at = created_at WHERE status_updated_at IS NULL")
-
-        reset_token_columns = {
-            row["name"]
-            for row in db.execute("PRAGMA table_info(user_password_reset_tokens)").fetchall()
-        }
-        if "sent_by_admin_user_id" not in reset_token_columns:
-            db.execute("ALTER TABLE user_password_reset_tokens ADD COLUMN sent_by_admin_user_id INTEGER")
+        # PRAGMA user_version évite de rejouer les PRAGMA table_info / ALTER TABLE
+        # à chaque démarrage une fois le schéma à jour.
+        current_version = db.execute("PRAGMA user_version").fetchone()[0]
+        if current_version != SCHEMA_VERSION:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS polls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    token TEXT UNIQUE NOT NULL,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    creator_name TEXT,
+                    created_by_user_id INTEGER,
+                    poll_type TEXT NOT NULL DEFAULT 'meeting',
+                    response_mode TEXT NOT NULL DEFAULT 'availability',
+                    deadline_at TEXT,
+                    deadline_epoch INTEGER,
+                    archived_at TEXT,
+                    archived_by_user_id INTEGER,
+                    organizer_code_hash TEXT,
+                    rgpd_creator_consent_at TEXT,
+                    rgpd_consent_version TEXT,
+                    rgpd_email_rights_confirmed INTEGER NOT NULL DEFAULT 0,
+                    rgpd_email_rights_confirmed_at TEXT,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS slots (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    poll_id INTEGER NOT NULL,
+                    label TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    FOREIGN KEY (poll_id) REFERENCES polls (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS votes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    poll_id INTEGER NOT NULL,
+                    slot_id INTEGER NOT NULL,
+                    participant_name TEXT NOT NULL,
+                    participant_email TEXT,
+                    choice TEXT NOT NULL,
+                    comment TEXT,
+                    rgpd_vote_consent_at TEXT,
+                    rgpd_consent_version TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (poll_id) REFERENCES polls (id),
+                    FOREIGN KEY (slot_id) REFERENCES slots (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    is_active INTEGER NOT NULL DEFAULT 1,
+                    is_admin INTEGER NOT NULL DEFAULT 0,
+                    consent_auth_at TEXT,
+                    consent_auth_version TEXT,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS feedbacks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    component TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    sender_name TEXT,
+                    sender_email TEXT,
+                    page_url TEXT,
+                    submitted_by_user_id INTEGER,
+                    status TEXT NOT NULL DEFAULT 'new',
+                    status_updated_at TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (submitted_by_user_id) REFERENCES users (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS auth_consent_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    event_type TEXT NOT NULL,
+                    consent_version TEXT,
+                    consent_at TEXT NOT NULL,
+                    source_ip TEXT,
+                    user_agent TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                );
+
+                CREATE TABLE IF NOT EXISTS user_password_reset_tokens (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    token_hash TEXT NOT NULL UNIQUE,
+                    created_at TEXT NOT NULL,
+                    expires_at TEXT NOT NULL,
+                    used_at TEXT,
+                    sent_by_admin_user_id INTEGER,
+                    FOREIGN KEY (user_id) REFERENCES users (id),
+                    FOREIGN KEY (sent_by_admin_user_id) REFERENCES users (id)
+                );
+                """
+            )
+
+            poll_columns = {
+                row["name"]
+                for row in db.execute("PRAGMA table_info(polls)").fetchall()
+            }
+            if "poll_type" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN poll_type TEXT NOT NULL DEFAULT 'meeting'")
+            if "created_by_user_id" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN created_by_user_id INTEGER")
+            if "response_mode" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN response_mode TEXT NOT NULL DEFAULT 'availability'")
+            if "deadline_at" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN deadline_at TEXT")
+            if "deadline_epoch" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN deadline_epoch INTEGER")
+            if "archived_at" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN archived_at TEXT")
+            if "archived_by_user_id" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN archived_by_user_id INTEGER")
+            if "organizer_code_hash" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN organizer_code_hash TEXT")
+            if "rgpd_creator_consent_at" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN rgpd_creator_consent_at TEXT")
+            if "rgpd_consent_version" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN rgpd_consent_version TEXT")
+            if "rgpd_email_rights_confirmed" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN rgpd_email_rights_confirmed INTEGER NOT NULL DEFAULT 0")
+            if "rgpd_email_rights_confirmed_at" not in poll_columns:
+                db.execute("ALTER TABLE polls ADD COLUMN rgpd_email_rights_confirmed_at TEXT")
+
+            vote_columns = {
+                row["name"]
+                for row in db.execute("PRAGMA table_info(votes)").fetchall()
+            }
+            if "participant_email" not in vote_columns:
+                db.execute("ALTER TABLE votes ADD COLUMN participant_email TEXT")
+            if "comment" not in vote_columns:
+                db.execute("ALTER TABLE votes ADD COLUMN comment TEXT")
+            if "rgpd_vote_consent_at" not in vote_columns:
+                db.execute("ALTER TABLE votes ADD COLUMN rgpd_vote_consent_at TEXT")
+            if "rgpd_consent_version" not in vote_columns:
+                db.execute("ALTER TABLE votes ADD COLUMN rgpd_consent_version TEXT")
+
+            user_columns = {
+                row["name"]
+                for row in db.execute("PRAGMA table_info(users)").fetchall()
+            }
+            if "is_active" not in user_columns:
+                db.execute("ALTER TABLE users ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
+            if "is_admin" not in user_columns:
+                db.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER NOT NULL DEFAULT 0")
+            if "consent_auth_at" not in user_columns:
+                db.execute("ALTER TABLE users ADD COLUMN consent_auth_at TEXT")
+            if "consent_auth_version" not in user_columns:
+                db.execute("ALTER TABLE users ADD COLUMN consent_auth_version TEXT")
+
+            feedback_columns = {
+                row["name"]
+                for row in db.execute("PRAGMA table_info(feedbacks)").fetchall()
+            }
+            if "submitted_by_user_id" not in feedback_columns:
+                db.execute("ALTER TABLE feedbacks ADD COLUMN submitted_by_user_id INTEGER")
+            if "status" not in feedback_columns:
+                db.execute("ALTER TABLE feedbacks ADD COLUMN status TEXT NOT NULL DEFAULT 'new'")
+            if "status_updated_at" not in feedback_columns:
+                db.execute("ALTER TABLE feedbacks ADD COLUMN status_updated_at TEXT")
+                db.execute("UPDATE feedbacks SET status_updated_at = created_at WHERE status_updated_at IS NULL")
+
+            reset_token_columns = {
+                row["name"]
+                for row in db.execute("PRAGMA table_info(user_password_reset_tokens)").fetchall()
+            }
+            if "sent_by_admin_user_id" not in reset_token_columns:
+                db.execute("ALTER TABLE user_password_reset_tokens ADD COLUMN sent_by_admin_user_id INTEGER")
+
+            db.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_votes_poll_slot ON votes(poll_id, slot_id, choice);
+                CREATE INDEX IF NOT EXISTS idx_votes_poll_participant ON votes(poll_id, participant_name);
+                CREATE INDEX IF NOT EXISTS idx_votes_poll_email ON votes(poll_id, participant_email);
+                CREATE INDEX IF NOT EXISTS idx_votes_poll_name_nocase
+                    ON votes(poll_id, participant_name COLLATE NOCASE)
+                    WHERE COALESCE(participant_email, '') = '';
+                CREATE INDEX IF NOT EXISTS idx_polls_owner_created ON polls(created_by_user_id, archived_at, created_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_slots_poll_pos ON slots(poll_id, position, id);
+                """
+            )
+
+            # Déduplique les anciens votes avant de poser l'index unique
+            # qui permet l'UPSERT du gestionnaire de vote.
+            db.execute(
+                """
+                DELETE FROM votes WHERE id NOT IN (
+                    SELECT MAX(id) FROM votes
+                    GROUP BY poll_id, slot_id,
+                        CASE WHEN COALESCE(participant_email, '') <> '' THEN LOWER(participant_email)
+                             ELSE 'name:' || LOWER(participant_name) END
+                )
+                """
+            )
+            db.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_votes_unique ON votes(
+                    poll_id, slot_id,
+                    CASE WHEN COALESCE(participant_email, '') <> '' THEN LOWER(participant_email)
+                         ELSE 'name:' || LOWER(participant_name) END
+                )
+                """
+            )
+
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
         if bootstrap_admin_email and EMAIL_REGEX.match(bootstrap_admin_email):
             db.execute(
@@ -540,25 +863,38 @@ def create_app() -> Flask:
         db.commit()
 
     def _csrf_token() -> str:
+        token = g.get("_csrf_token")
+        if token:
+            return token
+
         token = session.get("csrf_token")
         if not token:
             token = secrets.token_urlsafe(24)
             session["csrf_token"] = token
+        g._csrf_token = token
         return token
 
     def validate_csrf() -> bool:
-        form_token = request.form.get("csrf_token", "")
-        session_token = session.get("csrf_token", "")
-        return bool(form_token and session_token and secrets.compare_digest(form_token, session_token))
+        form_token = request.form.get("csrf_token")
+        if not form_token:
+            return False
+        session_token = g.get("_csrf_session_token")
+        if session_token is None:
+            session_token = session.get("csrf_token", "")
+            g._csrf_session_token = session_token
+        if not session_token:
+            return False
+        return secrets.compare_digest(form_token.encode(), session_token.encode())
 
-    def parse_deadline(value: str) -> str | None:
+    def parse_deadline(value: str) -> tuple[str, int] | None:
         if not value:
             return None
         try:
             parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M")
-            return parsed.isoformat(timespec="minutes")
         except ValueError:
             return None
+        epoch = int(parsed.replace(tzinfo=timezone.utc).timestamp())
+        return parsed.isoformat(timespec="minutes"), epoch
 
     def normalize_response_mode(raw_mode: str | None) -> str:
         mode = (raw_mode or "").strip().lower()
@@ -568,29 +904,52 @@ def create_app() -> Flask:
             return mode
         return "single"
 
-    def is_deadline_passed(deadline_at: str | None) -> bool:
+    def request_utcnow() -> datetime:
+        now = g.get("_request_utcnow")
+        if now is None:
+            now = datetime.utcnow()
+            g._request_utcnow = now
+        return now
+
+    def request_now_iso() -> str:
+        # Toutes les lignes écrites pendant une même requête partagent
+        # ainsi exactement le même horodatage.
+        now_iso = g.get("_request_now_iso")
+        if now_iso is None:
+            # strftime sur gmtime évite la construction d'un datetime
+            # complet juste pour formater un horodatage.
+            now_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+            g._request_now_iso = now_iso
+        return now_iso
+
+    def is_deadline_passed(poll: dict) -> bool:
+        epoch = poll.get("deadline_epoch")
+        if epoch is not None:
+            return time.time() > epoch
+
+        # Sondages créés avant l'ajout de deadline_epoch.
+        deadline_at = poll.get("deadline_at")
         if not deadline_at:
             return False
         try:
-            deadline = datetime.fromisoformat(deadline_at)
-            return datetime.utcnow() > deadline
+            return request_utcnow() > _parse_iso_cached(deadline_at)
         except ValueError:
             return False
 
-    def admin_session_key(poll_id: int) -> str:
-        return f"admin_poll_{poll_id}"
+    def hash_organizer_code(code: str) -> str:
+        digest = hmac.new(secret_key.encode(), code.encode(), "sha256").hexdigest()
+        return f"hmac-sha256${digest}"
 
-    def voter_session_key(poll_id: int) -> str:
-        return f"voter_poll_{poll_id}"
+    def verify_organizer_code(code_hash: str, code: str) -> bool:
+        if code_hash.startswith("hmac-sha256$"):
+            expected = hmac.new(secret_key.encode(), code.encode(), "sha256").hexdigest()
+            return hmac.compare_digest(code_hash[len("hmac-sha256$"):], expected)
+        # Sondages créés avant le passage au HMAC.
+        return check_password_hash(code_hash, code)
 
-    def is_admin_authenticated(poll: sqlite3.Row) -> bool:
+    def is_admin_authenticated(poll: dict) -> bool:
         return bool(session.get(admin_session_key(poll["id"]), False))
 
-    def recommendation(summary_rows: list[sqlite3.Row]) -> sqlite3.Row | None:
-        if not summary_rows:
-            return None
-        return max(summary_rows, key=lambda row: (row["yes_count"], -row["no_count"]))
-
     def get_current_ui_theme() -> str:
         raw_theme = (request.cookies.get("sondage_theme") or "default").strip().lower()
         if raw_theme in ALLOWED_UI_THEMES:
@@ -637,28 +996,9 @@ def create_app() -> Flask:
             "legal_contact_email": legal_contact_email,
         }
 
-    @app.before_request
     def enforce_optional_app_auth():
-        if not auth_enabled:
-            return None
-
-        public_endpoints = {
-            "auth_login",
-            "auth_register",
-            "auth_forgot_password",
-            "auth_set_password",
-            "privacy_policy",
-            "legal_notice",
-            "view_poll",
-            "vote",
-            "vote_status",
-            "feedback_submit",
-            "admin_login",
-            "admin_logout",
-            "static",
-        }
-
-        if request.endpoint in public_endpoints:
+        endpoint = request.endpoint
+        if endpoint is None or endpoint in _PUBLIC_ENDPOINTS:
             return None
 
         if app_session_authenticated():
@@ -667,51 +1007,126 @@ def create_app() -> Flask:
         next_url = request.full_path if request.method == "GET" and request.query_string else request.path
         return redirect(url_for("auth_login", next=next_url))
 
+    # Le crochet n'est enregistré que si l'authentification applicative
+    # est activée : sinon Flask ne l'appelle même pas.
+    if auth_enabled:
+        app.before_request(enforce_optional_app_auth)
+
+    security_headers = _STATIC_SECURITY_HEADERS
+    if app.config["SESSION_COOKIE_SECURE"]:
+        security_headers = security_headers + (
+            ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+        )
+
     @app.after_request
     def set_security_headers(response):
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "SAMEORIGIN"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=(), payment=(), usb=()"
-        response.headers["Content-Security-Policy"] = "default-src 'self'; base-uri 'self'; form-action 'self'; frame-ancestors 'self'; style-src 'self' https://fonts.googleapis.com; font-src 'self' https://fonts.gstatic.com; script-src 'self'; img-src 'self' data:;"
-        if app.config["SESSION_COOKIE_SECURE"]:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        response.headers.extend(security_headers)
         return response
 
-    def get_poll_by_token(token: str) -> sqlite3.Row | None:
-        db = get_db()
-        return db.execute("SELECT * FROM polls WHERE token = ?", (token,)).fetchone()
+    def invalidate_poll_cache(token: str, poll_id: int) -> None:
+        with _poll_cache_lock:
+            _poll_cache.pop(token, None)
+            _slots_cache.pop(poll_id, None)
+
+    def get_poll_by_token(token: str) -> dict | None:
+        cache = g.setdefault("poll_by_token_cache", {})
+        if token in cache:
+            return cache[token]
+
+        now = time.monotonic()
+        with _poll_cache_lock:
+            entry = _poll_cache.get(token)
+            if entry is not None and now - entry[0] <= POLL_CACHE_TTL:
+                cache[token] = entry[1]
+                return entry[1]
 
-    def get_poll_slots(poll_id: int) -> list[sqlite3.Row]:
         db = get_db()
-        return db.execute(
-            "SELECT * FROM slots WHERE poll_id = ? ORDER BY position ASC, id ASC",
-            (poll_id,),
-        ).fetchall()
+        row = db.execute("SELECT * FROM polls WHERE token = ?", (token,)).fetchone()
+        poll = dict(row) if row is not None else None
+        if poll is not None:
+            # Normalisé une fois ici : les vues lisent la clé précalculée.
+            poll["_response_mode_norm"] = normalize_response_mode(poll["response_mode"])
+            with _poll_cache_lock:
+                _poll_cache[token] = (now, poll)
+        cache[token] = poll
+        return poll
+
+    def get_poll_slots(poll_id: int) -> list[dict]:
+        cache = g.setdefault("poll_slots_cache", {})
+        if poll_id in cache:
+            return cache[poll_id]
+
+        now = time.monotonic()
+        with _poll_cache_lock:
+            entry = _slots_cache.get(poll_id)
+            if entry is not None and now - entry[0] <= POLL_CACHE_TTL:
+                cache[poll_id] = entry[1]
+                return entry[1]
 
-    def aggregate_results(poll_id: int) -> list[sqlite3.Row]:
         db = get_db()
-        return db.execute(
-            """
-            SELECT
-                s.id,
-                s.label,
-                COALESCE(SUM(CASE WHEN v.choice = 'yes' THEN 1 ELSE 0 END), 0) AS yes_count,
-                COALESCE(SUM(CASE WHEN v.choice = 'no' THEN 1 ELSE 0 END), 0) AS no_count
-            FROM slots s
-            LEFT JOIN votes v ON v.slot_id = s.id
-            WHERE s.poll_id = ?
-            GROUP BY s.id, s.label, s.position
-            ORDER BY s.position ASC, s.id ASC
-            """,
-            (poll_id,),
-        ).fetchall()
+        slots = [
+            dict(row)
+            for row in db.execute(
+                "SELECT * FROM slots WHERE poll_id = ? ORDER BY position ASC, id ASC",
+                (poll_id,),
+            ).fetchall()
+        ]
+        with _poll_cache_lock:
+            _slots_cache[poll_id] = (now, slots)
+        cache[poll_id] = slots
+        return slots
+
+    def invalidate_summary_cache(poll_id: int) -> None:
+        with _summary_cache_lock:
+            _summary_cache.pop(poll_id, None)
+
+    def aggregate_results(poll_id: int) -> list[dict]:
+        # La clé de validation change dès qu'un nouveau vote est inséré ;
+        # un re-vote UPSERT/DELETE peut laisser MAX(id) inchangé, d'où
+        # l'invalidation explicite dans vote() et delete_poll().
+        db = get_db()
+        votes_max_id = db.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM votes WHERE poll_id = ?", (poll_id,)
+        ).fetchone()[0]
+
+        with _summary_cache_lock:
+            entry = _summary_cache.get(poll_id)
+            if entry is not None and entry[0] == votes_max_id:
+                return entry[1]
+
+        # Les requêtes chaudes se passent de sqlite3.Row : un tuple par
+        # ligne suffit quand on connaît les colonnes par position.
+        cursor = db.cursor()
+        cursor.row_factory = None
+        rows = [
+            {"id": slot_id, "label": label, "yes_count": yes_count, "no_count": no_count}
+            for slot_id, label, yes_count, no_count in cursor.execute(
+                """
+                SELECT
+                    s.id,
+                    s.label,
+                    COALESCE(SUM(CASE WHEN v.choice = 'yes' THEN 1 ELSE 0 END), 0) AS yes_count,
+                    COALESCE(SUM(CASE WHEN v.choice = 'no' THEN 1 ELSE 0 END), 0) AS no_count
+                FROM slots s
+                LEFT JOIN votes v ON v.slot_id = s.id
+                WHERE s.poll_id = ?
+                GROUP BY s.id, s.label, s.position
+                ORDER BY s.position ASC, s.id ASC
+                """,
+                (poll_id,),
+            ).fetchall()
+        ]
+        with _summary_cache_lock:
+            _summary_cache[poll_id] = (votes_max_id, rows)
+        return rows
 
-    def participant_rows(poll_id: int) -> tuple[list[str], dict[str, dict[int, str]], dict[str, str]]:
+    def participant_data(poll_id: int) -> tuple[list[str], dict[str, dict[int, str]], dict[str, str], dict[str, str]]:
         db = get_db()
-        rows = db.execute(
+        cursor = db.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
             """
-            SELECT participant_name, participant_email, slot_id, choice
+            SELECT participant_name, participant_email, slot_id, choice, comment
             FROM votes
             WHERE poll_id = ?
             ORDER BY participant_name COLLATE NOCASE ASC, participant_email COLLATE NOCASE ASC
@@ -722,9 +1137,10 @@ def create_app() -> Flask:
         participants: list[str] = []
         matrix: dict[str, dict[int, str]] = {}
         labels: dict[str, str] = {}
-        for row in rows:
-            name = (row["participant_name"] or "").strip()
-            email = (row["participant_email"] or "").strip().lower()
+        comments: dict[str, str] = {}
+        for raw_name, raw_email, slot_id, choice, raw_comment in rows:
+            name = (raw_name or "").strip()
+            email = (raw_email or "").strip().lower()
             key = email or name
             if not key:
                 continue
@@ -738,26 +1154,39 @@ def create_app() -> Flask:
                     labels[key] = email.split("@", 1)[0]
                 else:
                     labels[key] = "Participant"
-            matrix[key][row["slot_id"]] = row["choice"]
-        return participants, matrix, labels
+            comment = (raw_comment or "").strip()
+            if comment and key not in comments:
+                comments[key] = comment
+            matrix[key][slot_id] = choice
+        return participants, matrix, labels, comments
 
-    def participant_comments(poll_id: int) -> dict[str, str]:
+    def existing_vote_rows(poll_id: int, email: str, name: str) -> list[tuple]:
         db = get_db()
-        rows = db.execute(
-            """
-            SELECT participant_name, participant_email, MAX(COALESCE(comment, '')) AS comment
-            FROM votes
-            WHERE poll_id = ?
-            GROUP BY participant_name, participant_email
-            """,
-            (poll_id,),
-        ).fetchall()
-        comments: dict[str, str] = {}
-        for row in rows:
-            key = (row["participant_email"] or "").strip().lower() or (row["participant_name"] or "").strip()
-            if key and row["comment"]:
-                comments[key] = row["comment"]
-        return comments
+        cursor = db.cursor()
+        cursor.row_factory = None
+        if email:
+            return cursor.execute(
+                """
+                SELECT slot_id, choice, comment
+                FROM votes
+                WHERE poll_id = ? AND participant_email = ?
+                ORDER BY id ASC
+                """,
+                (poll_id, email),
+            ).fetchall()
+        if name:
+            return cursor.execute(
+                """
+                SELECT slot_id, choice, comment
+                FROM votes
+                WHERE poll_id = ?
+                  AND COALESCE(participant_email, '') = ''
+                  AND participant_name = ? COLLATE NOCASE
+                ORDER BY id ASC
+                """,
+                (poll_id, name),
+            ).fetchall()
+        return []
 
     @app.get("/")
     def home() -> str:
@@ -794,18 +1223,20 @@ def create_app() -> Flask:
                 flash("Tu dois accepter la politique de confidentialité pour te connecter.", "error")
                 return redirect(url_for("auth_login", next=next_url))
 
-            if user is not None and check_password_hash(user["password_hash"], password):
+            if user is not None and verify_user_password(user, password):
                 if not bool(user["is_active"]):
                     flash("Compte désactivé. Contacte un administrateur.", "error")
                     return redirect(url_for("auth_login", next=next_url))
-                now = datetime.utcnow().isoformat(timespec="seconds")
+                now = request_now_iso()
                 db = get_db()
+                db.execute("BEGIN IMMEDIATE")
                 db.execute(
                     "UPDATE users SET consent_auth_at = ?, consent_auth_version = ? WHERE id = ?",
                     (now, consent_version, user["id"]),
                 )
                 log_auth_consent_event(user["id"], "auth_login")
                 db.commit()
+                invalidate_user_cache(user["id"])
                 session.clear()
                 session["app_user_id"] = user["id"]
                 session.permanent = True
@@ -839,16 +1270,17 @@ def create_app() -> Flask:
 
             generic_message = "Si un compte existe avec cet email, un lien de définition/changement de mot de passe a été envoyé."
 
-            if smtp_configured() and EMAIL_REGEX.match(email):
+            if smtp_configured and EMAIL_REGEX.match(email):
                 db = get_db()
                 user = db.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
 
                 if user is not None and bool(user["is_active"]):
                     raw_token = secrets.token_urlsafe(32)
                     token_hash = hash_password_reset_token(raw_token)
-                    created_at = datetime.utcnow().isoformat(timespec="seconds")
-                    expires_at = (datetime.utcnow() + timedelta(hours=password_reset_ttl_hours)).isoformat(timespec="seconds")
+                    created_at = request_now_iso()
+                    expires_at = (request_utcnow() + timedelta(hours=password_reset_ttl_hours)).isoformat(timespec="seconds")
 
+                    db.execute("BEGIN IMMEDIATE")
                     db.execute(
                         "DELETE FROM user_password_reset_tokens WHERE user_id = ? AND used_at IS NULL",
                         (user["id"],),
@@ -921,7 +1353,7 @@ def create_app() -> Flask:
                 return redirect(url_for("auth_login", next=next_url))
 
             db = get_db()
-            now = datetime.utcnow().isoformat(timespec="seconds")
+            now = request_now_iso()
             user_count = db.execute("SELECT COUNT(*) AS total FROM users").fetchone()["total"]
             is_first_user_admin = 1 if user_count == 0 else 0
             db.execute(
@@ -953,7 +1385,7 @@ def create_app() -> Flask:
             return redirect(url_for("home"))
 
         token_hash = hash_password_reset_token((token or "").strip())
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db = get_db()
         token_row = db.execute(
             """
@@ -993,7 +1425,8 @@ def create_app() -> Flask:
                 flash("Les mots de passe ne correspondent pas.", "error")
                 return redirect(url_for("auth_set_password", token=token))
 
-            applied_at = datetime.utcnow().isoformat(timespec="seconds")
+            applied_at = request_now_iso()
+            db.execute("BEGIN IMMEDIATE")
             db.execute(
                 "UPDATE users SET password_hash = ?, consent_auth_at = ?, consent_auth_version = ? WHERE id = ?",
                 (generate_password_hash(password), applied_at, consent_version, token_row["user_id"]),
@@ -1003,6 +1436,8 @@ def create_app() -> Flask:
                 (applied_at, token_row["id"]),
             )
             db.commit()
+            invalidate_user_cache(token_row["user_id"])
+            invalidate_auth_verify_cache(token_row["user_id"])
             session.clear()
             flash("Mot de passe enregistré. Tu peux maintenant te connecter.", "success")
             return redirect(url_for("auth_login"))
@@ -1176,7 +1611,7 @@ def create_app() -> Flask:
             flash("Feedback introuvable.", "error")
             return redirect(url_for("admin_feedbacks"))
 
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db.execute(
             "UPDATE feedbacks SET status = ?, status_updated_at = ? WHERE id = ?",
             (new_status, now, feedback_id),
@@ -1214,7 +1649,7 @@ def create_app() -> Flask:
             return redirect(url_for("admin_users"))
 
         db = get_db()
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db.execute(
             "INSERT INTO users (email, password_hash, is_active, is_admin, consent_auth_at, consent_auth_version, created_at) VALUES (?, ?, ?, ?, NULL, NULL, ?)",
             (email, generate_password_hash(password), 1 if is_active_new else 0, 1 if is_admin_new else 0, now),
@@ -1234,29 +1669,33 @@ def create_app() -> Flask:
             flash("Accès refusé: droits administrateur requis.", "error")
             return redirect(url_for("home"))
 
-        db = get_db()
-        target_user = db.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
-        if target_user is None:
-            flash("Compte introuvable.", "error")
-            return redirect(url_for("admin_users"))
-
-        if target_user["id"] == current_user["id"]:
+        if user_id == current_user["id"]:
             flash("Tu ne peux pas désactiver ton propre compte.", "error")
             return redirect(url_for("admin_users"))
 
-        new_value = 0 if bool(target_user["is_active"]) else 1
-
-        if new_value == 0 and bool(target_user["is_admin"]):
-            remaining_active_admins = db.execute(
-                "SELECT COUNT(*) AS total FROM users WHERE is_admin = 1 AND is_active = 1 AND id != ?",
-                (user_id,),
-            ).fetchone()["total"]
-            if remaining_active_admins < 1:
+        # Une seule requête : la bascule et l'invariant « au moins un
+        # administrateur actif » sont vérifiés atomiquement côté SQLite.
+        db = get_db()
+        cursor = db.execute(
+            """
+            UPDATE users SET is_active = 1 - is_active
+            WHERE id = ?
+              AND NOT (
+                  is_active = 1 AND is_admin = 1
+                  AND (SELECT COUNT(*) FROM users AS u2 WHERE u2.is_admin = 1 AND u2.is_active = 1 AND u2.id != users.id) < 1
+              )
+            """,
+            (user_id,),
+        )
+        db.commit()
+        if cursor.rowcount == 0:
+            if db.execute("SELECT 1 FROM users WHERE id = ?", (user_id,)).fetchone() is None:
+                flash("Compte introuvable.", "error")
+            else:
                 flash("Impossible: il doit rester au moins un administrateur actif.", "error")
-                return redirect(url_for("admin_users"))
+            return redirect(url_for("admin_users"))
 
-        db.execute("UPDATE users SET is_active = ? WHERE id = ?", (new_value, user_id))
-        db.commit()
+        invalidate_user_cache(user_id)
         flash("Statut du compte mis à jour.", "success")
         return redirect(url_for("admin_users"))
 
@@ -1271,29 +1710,32 @@ def create_app() -> Flask:
             flash("Accès refusé: droits administrateur requis.", "error")
             return redirect(url_for("home"))
 
-        db = get_db()
-        target_user = db.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
-        if target_user is None:
-            flash("Compte introuvable.", "error")
-            return redirect(url_for("admin_users"))
-
-        if target_user["id"] == current_user["id"] and bool(target_user["is_admin"]):
+        if user_id == current_user["id"]:
+            # current_user est forcément admin ici.
             flash("Tu ne peux pas retirer ton propre rôle administrateur.", "error")
             return redirect(url_for("admin_users"))
 
-        new_value = 0 if bool(target_user["is_admin"]) else 1
-
-        if new_value == 0 and bool(target_user["is_active"]):
-            remaining_active_admins = db.execute(
-                "SELECT COUNT(*) AS total FROM users WHERE is_admin = 1 AND is_active = 1 AND id != ?",
-                (user_id,),
-            ).fetchone()["total"]
-            if remaining_active_admins < 1:
+        db = get_db()
+        cursor = db.execute(
+            """
+            UPDATE users SET is_admin = 1 - is_admin
+            WHERE id = ?
+              AND NOT (
+                  is_admin = 1 AND is_active = 1
+                  AND (SELECT COUNT(*) FROM users AS u2 WHERE u2.is_admin = 1 AND u2.is_active = 1 AND u2.id != users.id) < 1
+              )
+            """,
+            (user_id,),
+        )
+        db.commit()
+        if cursor.rowcount == 0:
+            if db.execute("SELECT 1 FROM users WHERE id = ?", (user_id,)).fetchone() is None:
+                flash("Compte introuvable.", "error")
+            else:
                 flash("Impossible: il doit rester au moins un administrateur actif.", "error")
-                return redirect(url_for("admin_users"))
+            return redirect(url_for("admin_users"))
 
-        db.execute("UPDATE users SET is_admin = ? WHERE id = ?", (new_value, user_id))
-        db.commit()
+        invalidate_user_cache(user_id)
         flash("Rôle administrateur mis à jour.", "success")
         return redirect(url_for("admin_users"))
 
@@ -1308,7 +1750,7 @@ def create_app() -> Flask:
             flash("Accès refusé: droits administrateur requis.", "error")
             return redirect(url_for("home"))
 
-        if not smtp_configured():
+        if not smtp_configured:
             flash("SMTP non configuré: envoi d'email impossible.", "error")
             return redirect(url_for("admin_users"))
 
@@ -1325,9 +1767,10 @@ def create_app() -> Flask:
 
         raw_token = secrets.token_urlsafe(32)
         token_hash = hash_password_reset_token(raw_token)
-        created_at = datetime.utcnow().isoformat(timespec="seconds")
-        expires_at = (datetime.utcnow() + timedelta(hours=password_reset_ttl_hours)).isoformat(timespec="seconds")
+        created_at = request_now_iso()
+        expires_at = (request_utcnow() + timedelta(hours=password_reset_ttl_hours)).isoformat(timespec="seconds")
 
+        db.execute("BEGIN IMMEDIATE")
         db.execute(
             "DELETE FROM user_password_reset_tokens WHERE user_id = ? AND used_at IS NULL",
             (target_user["id"],),
@@ -1367,35 +1810,79 @@ def create_app() -> Flask:
             return redirect(url_for("auth_login", next=request.path))
 
         db = get_db()
+        # Pagination par jeu de clés sur (groupe archivé, created_at, id) :
+        # l'id départage les sondages créés dans la même seconde, et le
+        # coût d'une page reste borné quel que soit l'historique.
+        cursor_grp = request.args.get("cursor_grp")
+        cursor_created = request.args.get("cursor_created")
+        cursor_id = request.args.get("cursor_id", type=int)
+        first_page = 1 if cursor_grp is None or cursor_created is None or cursor_id is None else 0
+
+        # Un seul balayage agrégé de votes — restreint aux sondages de
+        # l'utilisateur — au lieu d'une sous-requête corrélée par ligne.
         polls = db.execute(
             """
             SELECT
                 p.*,
-                COALESCE(
-                    (
-                        SELECT COUNT(*)
-                        FROM (
-                            SELECT DISTINCT
-                                CASE
-                                    WHEN COALESCE(TRIM(v.participant_email), '') <> '' THEN LOWER(TRIM(v.participant_email))
-                                    ELSE 'name:' || LOWER(TRIM(v.participant_name))
-                                END AS voter_key
-                            FROM votes v
-                            WHERE v.poll_id = p.id
-                        ) u
-                    ),
-                    0
-                ) AS votes_count
+                COALESCE(v.votes_count, 0) AS votes_count
             FROM polls p
+            LEFT JOIN (
+                SELECT
+                    poll_id,
+                    COUNT(DISTINCT
+                        CASE
+                            WHEN COALESCE(TRIM(participant_email), '') <> '' THEN LOWER(TRIM(participant_email))
+                            ELSE 'name:' || LOWER(TRIM(participant_name))
+                        END
+                    ) AS votes_count
+                FROM votes
+                WHERE poll_id IN (SELECT id FROM polls WHERE created_by_user_id = ?)
+                GROUP BY poll_id
+            ) v ON v.poll_id = p.id
             WHERE p.created_by_user_id = ?
-            ORDER BY COALESCE(p.archived_at, ''), p.created_at DESC
+              AND (
+                  ? = 1
+                  OR COALESCE(p.archived_at, '') > ?
+                  OR (
+                      COALESCE(p.archived_at, '') = ?
+                      AND (p.created_at < ? OR (p.created_at = ? AND p.id < ?))
+                  )
+              )
+            ORDER BY COALESCE(p.archived_at, ''), p.created_at DESC, p.id DESC
+            LIMIT ?
             """,
-            (current_user["id"],),
+            (
+                current_user["id"],
+                current_user["id"],
+                first_page,
+                cursor_grp or "",
+                cursor_grp or "",
+                cursor_created or "",
+                cursor_created or "",
+                cursor_id or 0,
+                MY_POLLS_PAGE_SIZE + 1,
+            ),
         ).fetchall()
 
-        active_polls = [poll for poll in polls if not poll["archived_at"]]
-        archived_polls = [poll for poll in polls if poll["archived_at"]]
-        return render_template("my_polls.html", active_polls=active_polls, archived_polls=archived_polls)
+        next_cursor = None
+        if len(polls) > MY_POLLS_PAGE_SIZE:
+            polls = polls[:MY_POLLS_PAGE_SIZE]
+            last = polls[-1]
+            next_cursor = {
+                "cursor_grp": last["archived_at"] or "",
+                "cursor_created": last["created_at"],
+                "cursor_id": last["id"],
+            }
+
+        # Le tri place les sondages actifs en tête : une coupe d'index
+        # suffit, sans re-parcourir deux fois la liste.
+        split = next((index for index, poll in enumerate(polls) if poll["archived_at"]), len(polls))
+        return render_template(
+            "my_polls.html",
+            active_polls=polls[:split],
+            archived_polls=polls[split:],
+            next_cursor=next_cursor,
+        )
 
     @app.get("/poll/<token>/edit")
     def edit_poll_page(token: str):
@@ -1415,7 +1902,7 @@ def create_app() -> Flask:
 
         # Vérifie s'il y a des votes
         db = get_db()
-        votes_exist = db.execute("SELECT 1 FROM votes WHERE poll_id = ? LIMIT 1", (poll["id"],)).fetchone() is not None
+        votes_exist = db.execute(SQL_POLL_HAS_VOTES, (poll["id"],)).fetchone() is not None
         if votes_exist:
             flash("Impossible de modifier: des votes ont déjà été enregistrés.", "error")
             return redirect(url_for("my_polls"))
@@ -1447,7 +1934,7 @@ def create_app() -> Flask:
             return redirect(url_for("my_polls"))
 
         db = get_db()
-        votes_exist = db.execute("SELECT 1 FROM votes WHERE poll_id = ? LIMIT 1", (poll["id"],)).fetchone() is not None
+        votes_exist = db.execute(SQL_POLL_HAS_VOTES, (poll["id"],)).fetchone() is not None
         if votes_exist:
             flash("Impossible de modifier: des votes ont déjà été enregistrés.", "error")
             return redirect(url_for("my_polls"))
@@ -1458,13 +1945,14 @@ def create_app() -> Flask:
         poll_type = request.form.get("poll_type", "meeting").strip().lower()
         response_mode = normalize_response_mode(request.form.get("response_mode", "single"))
         deadline_input = request.form.get("deadline_at", "").strip()
-        deadline_at = parse_deadline(deadline_input)
+        parsed_deadline = parse_deadline(deadline_input)
+        deadline_at, deadline_epoch = parsed_deadline if parsed_deadline is not None else (None, None)
         raw_slots = request.form.get("slots", "")
         slots = [line.strip()[:120] for line in raw_slots.splitlines() if line.strip()]
 
         if poll_type not in ALLOWED_POLL_TYPES:
             poll_type = "meeting"
-        if deadline_input and deadline_at is None:
+        if deadline_input and parsed_deadline is None:
             flash("Date limite invalide.", "error")
             return redirect(url_for("edit_poll_page", token=token))
         if not title:
@@ -1478,9 +1966,10 @@ def create_app() -> Flask:
             return redirect(url_for("edit_poll_page", token=token))
 
         # Met à jour le sondage
+        db.execute("BEGIN IMMEDIATE")
         db.execute(
-            "UPDATE polls SET title = ?, description = ?, poll_type = ?, response_mode = ?, deadline_at = ? WHERE id = ?",
-            (title, description, poll_type, response_mode, deadline_at, poll["id"]),
+            "UPDATE polls SET title = ?, description = ?, poll_type = ?, response_mode = ?, deadline_at = ?, deadline_epoch = ? WHERE id = ?",
+            (title, description, poll_type, response_mode, deadline_at, deadline_epoch, poll["id"]),
         )
         # Supprime les anciens créneaux
         db.execute("DELETE FROM slots WHERE poll_id = ?", (poll["id"],))
@@ -1491,6 +1980,10 @@ def create_app() -> Flask:
                 (poll["id"], label, position),
             )
         db.commit()
+        invalidate_poll_cache(token, poll["id"])
+        # Les créneaux réécrits changent les libellés du résumé alors que
+        # MAX(votes.id) reste à 0 : la clé seule ne suffit pas ici non plus.
+        invalidate_summary_cache(poll["id"])
         flash("Sondage modifié avec succès.", "success")
         return redirect(url_for("view_poll", token=token))
 
@@ -1522,13 +2015,14 @@ def create_app() -> Flask:
             db.execute("UPDATE polls SET archived_at = NULL, archived_by_user_id = NULL WHERE id = ?", (poll["id"],))
             flash("Sondage désarchivé.", "success")
         else:
-            now = datetime.utcnow().isoformat(timespec="seconds")
+            now = request_now_iso()
             db.execute(
                 "UPDATE polls SET archived_at = ?, archived_by_user_id = ? WHERE id = ?",
                 (now, current_user["id"], poll["id"]),
             )
             flash("Sondage archivé.", "success")
         db.commit()
+        invalidate_poll_cache(token, poll["id"])
         return redirect(url_for("my_polls"))
 
     @app.post("/poll/<token>/delete")
@@ -1558,10 +2052,13 @@ def create_app() -> Flask:
             return redirect(url_for("my_polls"))
 
         db = get_db()
+        db.execute("BEGIN IMMEDIATE")
         db.execute("DELETE FROM votes WHERE poll_id = ?", (poll["id"],))
         db.execute("DELETE FROM slots WHERE poll_id = ?", (poll["id"],))
         db.execute("DELETE FROM polls WHERE id = ?", (poll["id"],))
         db.commit()
+        invalidate_poll_cache(token, poll["id"])
+        invalidate_summary_cache(poll["id"])
 
         session.pop(admin_session_key(poll["id"]), None)
         session.pop(voter_session_key(poll["id"]), None)
@@ -1595,9 +2092,10 @@ def create_app() -> Flask:
 
         if poll_type not in ALLOWED_POLL_TYPES:
             poll_type = "meeting"
-        deadline_at = parse_deadline(deadline_input)
+        parsed_deadline = parse_deadline(deadline_input)
+        deadline_at, deadline_epoch = parsed_deadline if parsed_deadline is not None else (None, None)
 
-        if deadline_input and deadline_at is None:
+        if deadline_input and parsed_deadline is None:
             flash("Date limite invalide.", "error")
             return redirect(url_for("home"))
 
@@ -1626,7 +2124,10 @@ def create_app() -> Flask:
             flash("Le code organisateur doit contenir au moins 8 caractères.", "error")
             return redirect(url_for("home"))
 
-        organizer_code_hash = generate_password_hash(organizer_code)
+        # Le code organisateur est un jeton d'accès de faible valeur: un
+        # HMAC-SHA256 clé par la clé secrète suffit et la vérification est
+        # instantanée, contrairement à un KDF complet.
+        organizer_code_hash = hash_organizer_code(organizer_code)
         participant_emails = parse_email_list(participant_emails_raw)
         current_user = get_current_user()
         created_by_user_id = current_user["id"] if current_user is not None else None
@@ -1636,12 +2137,13 @@ def create_app() -> Flask:
             return redirect(url_for("home"))
 
         token = secrets.token_urlsafe(6)
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         rgpd_email_rights_confirmed = 1 if bool(participant_emails and rgpd_email_rights_ok) else 0
         rgpd_email_rights_confirmed_at = now if rgpd_email_rights_confirmed else None
 
         db = get_db()
-        db.execute(
+        db.execute("BEGIN IMMEDIATE")
+        cursor = db.execute(
             """
             INSERT INTO polls (
                 token,
@@ -1652,6 +2154,7 @@ def create_app() -> Flask:
                 poll_type,
                 response_mode,
                 deadline_at,
+                deadline_epoch,
                 organizer_code_hash,
                 rgpd_creator_consent_at,
                 rgpd_consent_version,
@@ -1659,7 +2162,7 @@ def create_app() -> Flask:
                 rgpd_email_rights_confirmed_at,
                 created_at
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 token,
@@ -1670,6 +2173,7 @@ def create_app() -> Flask:
                 poll_type,
                 response_mode,
                 deadline_at,
+                deadline_epoch,
                 organizer_code_hash,
                 now,
                 consent_version,
@@ -1678,25 +2182,22 @@ def create_app() -> Flask:
                 now,
             ),
         )
-        poll_id = db.execute("SELECT id FROM polls WHERE token = ?", (token,)).fetchone()["id"]
+        poll_id = cursor.lastrowid
 
-        for position, label in enumerate(slots, start=1):
-            db.execute(
-                "INSERT INTO slots (poll_id, label, position) VALUES (?, ?, ?)",
-                (poll_id, label, position),
-            )
+        db.executemany(
+            "INSERT INTO slots (poll_id, label, position) VALUES (?, ?, ?)",
+            [(poll_id, label, position) for position, label in enumerate(slots, start=1)],
+        )
 
         db.commit()
         session[admin_session_key(poll_id)] = True
         poll_link = url_for("view_poll", token=token, _external=True)
-        sent_count, failed_count, _ = send_poll_invitations(participant_emails, title, poll_link, creator_name)
 
-        if participant_emails and not smtp_configured():
+        if participant_emails and not smtp_configured:
             flash("Sondage créé. SMTP non configuré: invitations non envoyées.", "error")
-        elif participant_emails and sent_count > 0 and failed_count == 0:
-            flash(f"Sondage créé. Invitations envoyées ({sent_count}).", "success")
-        elif participant_emails and sent_count > 0 and failed_count > 0:
-            flash(f"Sondage créé. Invitations envoyées: {sent_count}, échecs: {failed_count}.", "error")
+        elif participant_emails:
+            _mail_pool.submit(send_poll_invitations, participant_emails, title, poll_link, creator_name)
+            flash(f"Sondage créé. Invitations en cours d'envoi ({len(participant_emails)}).", "success")
         else:
             flash("Sondage créé avec succès. Partage le lien !", "success")
 
@@ -1713,12 +2214,11 @@ def create_app() -> Flask:
         slots = get_poll_slots(poll["id"])
         summary = aggregate_results(poll["id"])
         summary_sorted = sorted(summary, key=lambda row: (-int(row["yes_count"]), int(row["no_count"]), row["label"].lower()))
-        participants, matrix, participant_labels = participant_rows(poll["id"])
-        comments = participant_comments(poll["id"])
-        top_choice = recommendation(summary_sorted)
+        participants, matrix, participant_labels, comments = participant_data(poll["id"])
+        top_choice = summary_sorted[0] if summary_sorted else None
         admin_mode = is_admin_authenticated(poll)
         is_archived = bool(poll["archived_at"])
-        closed = is_archived or is_deadline_passed(poll["deadline_at"])
+        closed = is_archived or is_deadline_passed(poll)
 
         organizer_prefill_name = ""
         organizer_prefill_email = ""
@@ -1743,63 +2243,33 @@ def create_app() -> Flask:
             if not organizer_prefill_name and organizer_prefill_email:
                 organizer_prefill_name = organizer_prefill_email.split("@", 1)[0]
 
-            db = get_db()
-            organizer_has_voted = db.execute(
-                "SELECT 1 FROM votes WHERE poll_id = ? AND participant_email = ? LIMIT 1",
-                (poll["id"], organizer_prefill_email),
-            ).fetchone() is not None
-
-            if organizer_has_voted:
-                organizer_rows = db.execute(
-                    """
-                    SELECT slot_id, choice, comment
-                    FROM votes
-                    WHERE poll_id = ? AND participant_email = ?
-                    ORDER BY id ASC
-                    """,
-                    (poll["id"], organizer_prefill_email),
-                ).fetchall()
-                for organizer_row in organizer_rows:
-                    existing_choice_by_slot[int(organizer_row["slot_id"])] = organizer_row["choice"]
-                    if not existing_comment and (organizer_row["comment"] or "").strip():
-                        existing_comment = (organizer_row["comment"] or "").strip()
-
-        voter_state = session.get(voter_session_key(poll["id"]), {})
-        if isinstance(voter_state, dict):
+            organizer_rows = existing_vote_rows(poll["id"], organizer_prefill_email, "")
+            organizer_has_voted = bool(organizer_rows)
+            for slot_id, choice, comment in organizer_rows:
+                existing_choice_by_slot[int(slot_id)] = choice
+                if not existing_comment and (comment or "").strip():
+                    existing_comment = (comment or "").strip()
+
+        # Visiteur anonyme sans état de vote : pas de clé en session, donc
+        # aucun travail de chaîne ni de requête supplémentaire.
+        voter_state = session.get(voter_session_key(poll["id"]))
+        if isinstance(voter_state, dict) and voter_state:
             voter_identity_name = (voter_state.get("name") or "").strip()[:80]
             voter_identity_email = (voter_state.get("email") or "").strip().lower()
 
-        if voter_identity_email or voter_identity_name:
-            db = get_db()
-            if voter_identity_email:
-                voter_rows = db.execute(
-                    """
-                    SELECT slot_id, choice, comment
-                    FROM votes
-                    WHERE poll_id = ? AND participant_email = ?
-                    ORDER BY id ASC
-                    """,
-                    (poll["id"], voter_identity_email),
-                ).fetchall()
-            else:
-                voter_rows = db.execute(
-                    """
-                    SELECT slot_id, choice, comment
-                    FROM votes
-                    WHERE poll_id = ?
-                      AND COALESCE(participant_email, '') = ''
-                      AND participant_name = ? COLLATE NOCASE
-                    ORDER BY id ASC
-                    """,
-                    (poll["id"], voter_identity_name),
-                ).fetchall()
-
+        # L'organisateur vient d'être interrogé avec le même email : inutile
+        # de refaire la même requête pour le votant.
+        same_as_organizer = bool(organizer_prefill_email) and voter_identity_email == organizer_prefill_email
+        if (voter_identity_email or voter_identity_name) and not same_as_organizer:
+            voter_rows = existing_vote_rows(poll["id"], voter_identity_email, voter_identity_name)
             if voter_rows:
                 voter_has_voted = True
-                for voter_row in voter_rows:
-                    existing_choice_by_slot[int(voter_row["slot_id"])] = voter_row["choice"]
-                    if not existing_comment and (voter_row["comment"] or "").strip():
-                        existing_comment = (voter_row["comment"] or "").strip()
+                for slot_id, choice, comment in voter_rows:
+                    existing_choice_by_slot[int(slot_id)] = choice
+                    if not existing_comment and (comment or "").strip():
+                        existing_comment = (comment or "").strip()
+        elif same_as_organizer:
+            voter_has_voted = organizer_has_voted
 
         if not organizer_prefill_name and voter_identity_name:
             organizer_prefill_name = voter_identity_name
@@ -1811,7 +2281,7 @@ def create_app() -> Flask:
         replace_vote_default_checked = has_existing_vote and edit_vote_mode
         voter_identity_label = voter_identity_email or voter_identity_name
 
-        poll_response_mode = normalize_response_mode(poll["response_mode"])
+        poll_response_mode = poll["_response_mode_norm"]
 
         return render_template(
             "poll.html",
@@ -1853,9 +2323,19 @@ def create_app() -> Flask:
             flash("Sondage introuvable.", "error")
             return redirect(url_for("home"))
 
+        now_ts = time.monotonic()
+        with _admin_login_attempts_lock:
+            attempts = _admin_login_attempts[poll["id"]]
+            while attempts and now_ts - attempts[0] > ADMIN_LOGIN_WINDOW_SECONDS:
+                attempts.popleft()
+            if len(attempts) >= ADMIN_LOGIN_MAX_ATTEMPTS:
+                flash("Trop de tentatives. Attends une minute puis réessaie.", "error")
+                return redirect(url_for("view_poll", token=token))
+            attempts.append(now_ts)
+
         code = request.form.get("organizer_code", "").strip()
         code_hash = poll["organizer_code_hash"] or ""
-        if not code or not code_hash or not check_password_hash(code_hash, code):
+        if not code or not code_hash or not verify_organizer_code(code_hash, code):
             flash("Code organisateur incorrect.", "error")
             return redirect(url_for("view_poll", token=token))
 
@@ -1893,7 +2373,7 @@ def create_app() -> Flask:
             flash("Le sondage est archivé: les votes sont fermés.", "error")
             return redirect(url_for("view_poll", token=token))
 
-        if is_deadline_passed(poll["deadline_at"]):
+        if is_deadline_passed(poll):
             flash("Le sondage est clôturé (date limite dépassée).", "error")
             return redirect(url_for("view_poll", token=token))
 
@@ -1921,54 +2401,23 @@ def create_app() -> Flask:
             flash("Ce sondage ne contient aucun créneau.", "error")
             return redirect(url_for("view_poll", token=token))
 
-        now = datetime.utcnow().isoformat(timespec="seconds")
+        now = request_now_iso()
         db = get_db()
 
         if participant_email:
             duplicate_vote = db.execute(
-                """
-                SELECT 1
-                FROM votes
-                WHERE poll_id = ? AND participant_email = ?
-                LIMIT 1
-                """,
-                (poll["id"], participant_email),
+                SQL_VOTE_EXISTS_BY_EMAIL, (poll["id"], participant_email)
             ).fetchone()
         else:
             duplicate_vote = db.execute(
-                """
-                SELECT 1
-                FROM votes
-                WHERE poll_id = ?
-                  AND COALESCE(participant_email, '') = ''
-                  AND participant_name = ? COLLATE NOCASE
-                LIMIT 1
-                """,
-                (poll["id"], participant_name),
+                SQL_VOTE_EXISTS_BY_NAME, (poll["id"], participant_name)
             ).fetchone()
 
-        if duplicate_vote is not None:
-            if not replace_existing_vote:
-                flash("Vote déjà enregistré pour cette personne. Coche « Modifier mon vote » pour le remplacer.", "error")
-                return redirect(url_for("view_poll", token=token))
-
-            if participant_email:
-                db.execute(
-                    "DELETE FROM votes WHERE poll_id = ? AND participant_email = ?",
-                    (poll["id"], participant_email),
-                )
-            else:
-                db.execute(
-                    """
-                    DELETE FROM votes
-                    WHERE poll_id = ?
-                      AND COALESCE(participant_email, '') = ''
-                      AND participant_name = ? COLLATE NOCASE
-                    """,
-                    (poll["id"], participant_name),
-                )
+        if duplicate_vote is not None and not replace_existing_vote:
+            flash("Vote déjà enregistré pour cette personne. Coche « Modifier mon vote » pour le remplacer.", "error")
+            return redirect(url_for("view_poll", token=token))
 
-        response_mode = normalize_response_mode(poll["response_mode"])
+        response_mode = poll["_response_mode_norm"]
 
         allowed_slot_ids = {slot["id"] for slot in slots}
         selected_slot_id: int | None = None
@@ -1992,25 +2441,46 @@ def create_app() -> Flask:
                     if slot_id in allowed_slot_ids:
                         selected_multiple.add(slot_id)
 
-        for slot in slots:
-            if response_mode == "single":
-                if slot["id"] != selected_slot_id:
-                    continue
-                choice = "yes"
-            else:
-                if slot["id"] not in selected_multiple:
-                    continue
-                choice = "yes"
+        if response_mode == "single":
+            voted_slot_ids = [slot["id"] for slot in slots if slot["id"] == selected_slot_id]
+        else:
+            voted_slot_ids = [slot["id"] for slot in slots if slot["id"] in selected_multiple]
 
-            db.execute(
-                """
-                INSERT INTO votes (poll_id, slot_id, participant_name, participant_email, choice, comment, rgpd_vote_consent_at, rgpd_consent_version, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (poll["id"], slot["id"], participant_name, participant_email, choice, comment, now, consent_version, now),
-            )
+        vote_rows = [
+            (poll["id"], slot_id, participant_name, participant_email, "yes", comment, now, consent_version, now)
+            for slot_id in voted_slot_ids
+        ]
 
+        db.execute("BEGIN IMMEDIATE")
+        if duplicate_vote is not None:
+            # L'UPSERT couvre les créneaux conservés ; il ne reste à effacer
+            # que ceux désélectionnés par rapport au vote précédent. Sans
+            # aucun créneau conservé, tout l'ancien vote part (pas de
+            # NOT IN (NULL), qui ne matcherait jamais rien en SQL).
+            if voted_slot_ids:
+                slot_filter = " AND slot_id NOT IN ({})".format(", ".join("?" for _ in voted_slot_ids))
+            else:
+                slot_filter = ""
+            if participant_email:
+                db.execute(
+                    "DELETE FROM votes WHERE poll_id = ? AND participant_email = ?" + slot_filter,
+                    (poll["id"], participant_email, *voted_slot_ids),
+                )
+            else:
+                db.execute(
+                    f"""
+                    DELETE FROM votes
+                    WHERE poll_id = ?
+                      AND COALESCE(participant_email, '') = ''
+                      AND participant_name = ? COLLATE NOCASE{slot_filter}
+                    """,
+                    (poll["id"], participant_name, *voted_slot_ids),
+                )
+        db.executemany(SQL_VOTE_UPSERT, vote_rows)
         db.commit()
+        # Un remplacement de vote peut modifier les lignes en place sans
+        # changer MAX(id) : on n'attend pas l'auto-invalidation du cache.
+        invalidate_summary_cache(poll["id"])
         session[voter_session_key(poll["id"])] = {
             "name": participant_name,
             "email": participant_email,
@@ -2064,15 +2534,15 @@ def create_app() -> Flask:
             flash("Feedback non enregistré. Réessaie dans un instant.", "error")
             return redirect(safe_redirect)
 
-        sent = send_feedback_email(
-            component=component,
-            message_text=message_text,
-            sender_name=sender_name,
-            sender_email=sender_email,
-            page_url=page_url,
-        )
-
-        if sent:
+        if smtp_configured and feedback_to_email:
+            _mail_pool.submit(
+                send_feedback_email,
+                component=component,
+                message_text=message_text,
+                sender_name=sender_name,
+                sender_email=sender_email,
+                page_url=page_url,
+            )
             flash("Merci 🙌 Ton feedback a bien été envoyé.", "success")
         else:
             flash("Feedback enregistré ✅ (email non envoyé: vérifie SMTP/FEEDBACK_TO_EMAIL).", "error")
@@ -2088,28 +2558,18 @@ def create_app() -> Flask:
         email = request.args.get("email", "").strip().lower()
         name = request.args.get("name", "").strip()
 
-        db = get_db()
-        exists = None
+        if email and not EMAIL_REGEX.match(email):
+            email = ""
+        if not email and not name:
+            return jsonify({"exists": False})
 
-        if email and EMAIL_REGEX.match(email):
-            exists = db.execute(
-                "SELECT 1 FROM votes WHERE poll_id = ? AND participant_email = ? LIMIT 1",
-                (poll["id"], email),
-            ).fetchone()
-        elif name:
-            exists = db.execute(
-                """
-                SELECT 1
-                FROM votes
-                WHERE poll_id = ?
-                  AND COALESCE(participant_email, '') = ''
-                  AND participant_name = ? COLLATE NOCASE
-                LIMIT 1
-                """,
-                (poll["id"], name),
-            ).fetchone()
+        # Une seule requête préparée quel que soit le mode d'identité.
+        db = get_db()
+        exists = db.execute(
+            SQL_VOTE_EXISTS_ANY, (poll["id"], email, email, email, name)
+        ).fetchone()[0]
 
-        return jsonify({"exists": exists is not None})
+        return jsonify({"exists": bool(exists)})
 
     with app.app_context():
         init_db()
@@ -104,9 +104,9 @@ function chooseSuggestion(index) {
 }
 
 async function fetchSuggestions(query) {
-    if (query.length < 2) {
+    if (query.length < 3 && !query.includes(" ")) {
         hideSuggestions();
-        setStatus("Entre au moins 2 caractères pour lancer l’autocomplétion.");
+        setStatus("Entre au moins 3 caractères pour lancer l’autocomplétion.");
         return;
     }
 
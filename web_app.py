@@ -1,14 +1,210 @@
 from __future__ import annotations
 
+import concurrent.futures
+import copy
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import zip_longest
 from typing import Any
+from urllib.parse import urlsplit
 
 import requests
 from flask import Flask, jsonify, render_template, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # Accélération optionnelle de la sérialisation JSON.
+    orjson = None
+
+try:
+    import redis
+except ImportError:  # Dépendance optionnelle pour les déploiements multi-workers.
+    redis = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Compression optionnelle des réponses (brotli/gzip).
+    Compress = None
+
+try:
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+except ImportError:  # Limitation de débit optionnelle par adresse IP.
+    Limiter = None
 
 
 GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Session partagée : le pool urllib3 garde les connexions TLS ouvertes
+# vers Open-Meteo entre les requêtes Flask.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip", "User-Agent": "sondage-meteo/1.0"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            connect=2,
+            read=1,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
+# (connexion, lecture) : échec rapide si l'API est injoignable, sans
+# couper les réponses lentes mais valides.
+REQUEST_TIMEOUT = (3.05, 12)
+
+# Les géocodages sont quasi statiques et les prévisions ne bougent
+# qu'à l'heure : un cache TTL borné absorbe les rafales de requêtes.
+GEOCODING_CACHE_TTL = 86400.0
+# Les recherches sans résultat (fautes de frappe) sont mémorisées aussi,
+# mais brièvement : une ville fraîchement ajoutée redevient vite trouvable.
+GEOCODING_NEGATIVE_TTL = 300.0
+FORECAST_CACHE_TTL = 600.0
+CACHE_MAX_ENTRIES = 4096
+
+_geo_cache: OrderedDict = OrderedDict()
+_forecast_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Cache partagé optionnel : chaque worker gunicorn a son cache local,
+# Redis mutualise les réponses entre workers quand REDIS_URL est défini.
+_REDIS = None
+if redis is not None and os.environ.get("REDIS_URL"):
+    _REDIS = redis.Redis.from_url(os.environ["REDIS_URL"], socket_timeout=0.25, decode_responses=True)
+
+
+def _shared_cache_get(key: str) -> Any | None:
+    if _REDIS is None:
+        return None
+    try:
+        raw = _REDIS.get(key)
+    except redis.RedisError as exc:
+        logging.warning("Cache Redis indisponible en lecture: %s", exc)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def _shared_cache_put(key: str, ttl: float, value: Any) -> None:
+    if _REDIS is None:
+        return
+    try:
+        _REDIS.setex(key, int(ttl), json.dumps(value, separators=(",", ":")))
+    except redis.RedisError as exc:
+        logging.warning("Cache Redis indisponible en écriture: %s", exc)
+
+
+def _cache_get(cache: OrderedDict, key: object, ttl: float, empty_ttl: float | None = None) -> Any | None:
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        timestamp, value = entry
+        if empty_ttl is not None and not value:
+            ttl = empty_ttl
+        if time.monotonic() - timestamp > ttl:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return copy.copy(value)
+
+
+def _cache_put(cache: OrderedDict, key: object, value: Any) -> None:
+    with _cache_lock:
+        cache[key] = (time.monotonic(), value)
+        cache.move_to_end(key)
+        while len(cache) > CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+# Dataclasses à slots pour les lignes du payload météo : allocation plus
+# compacte qu'un dict et champs positionnels ; orjson comme le provider
+# Flask par défaut les sérialisent tels quels.
+@dataclass(slots=True)
+class CurrentWeather:
+    temperature: float | None
+    humidity: float | None
+    wind: float | None
+    weather: str
+
+
+@dataclass(slots=True)
+class WeatherQuery:
+    """Paramètres de /api/weather, extraits de la query string en un passage."""
+
+    city: str
+    latitude: float | None
+    longitude: float | None
+    country: str
+    admin1: str | None
+
+    @classmethod
+    def from_args(cls, args: Any) -> WeatherQuery:
+        return cls(
+            args.get("city", "").strip(),
+            args.get("lat", type=float),
+            args.get("lon", type=float),
+            args.get("country", "Pays inconnu"),
+            args.get("admin1"),
+        )
+
+    @property
+    def has_coords(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    def as_place(self) -> dict[str, Any]:
+        return {
+            "name": self.city or "Ville sélectionnée",
+            "country": self.country,
+            "admin1": self.admin1,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+        }
+
+
+@dataclass(slots=True)
+class DayForecast:
+    date: str
+    weather: str
+    temp_min: float | None
+    temp_max: float | None
+    rain: float | None
+
+
+# Préchauffe en arrière-plan la météo de la première suggestion : si
+# l'utilisateur la choisit, la connexion (et le cache) sont déjà prêts.
+_PREFETCH_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="meteo-prefetch")
+
+
+def _warm_dns() -> None:
+    # Résout les hôtes Open-Meteo au démarrage du worker : la première
+    # vraie requête n'attend pas le résolveur en plus du handshake TLS.
+    for url in (GEOCODING_URL, FORECAST_URL):
+        try:
+            socket.getaddrinfo(urlsplit(url).hostname, 443, proto=socket.IPPROTO_TCP)
+        except OSError:
+            pass
+
+
+_PREFETCH_POOL.submit(_warm_dns)
+
 WEATHER_CODES = {
     0: "Ciel dégagé",
     1: "Principalement dégagé",
@@ -40,23 +236,104 @@ WEATHER_CODES = {
     99: "Orage avec grêle forte",
 }
 
+# orjson parse les octets bruts directement ; json stdlib sait aussi le
+# faire, sans repasser par le décodage UTF-8 anticipé de response.json().
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_WEATHER_FALLBACK = "Description indisponible"
+# Table indexée par code : un accès tuple en C au lieu d'un hachage dict.
+WEATHER_CODES_ARR = tuple(WEATHER_CODES.get(code, _WEATHER_FALLBACK) for code in range(100))
+
 app = Flask(__name__)
 
+if Compress is not None:
+    # Ne compresse que les réponses qui en valent la peine ; brotli
+    # d'abord quand le navigateur l'accepte, gzip sinon.
+    app.config["COMPRESS_MIN_SIZE"] = 500
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    Compress(app)
+
+if Limiter is not None:
+    # L'autocomplétion part à chaque frappe : 20 req/s par IP suffisent
+    # largement à un humain et coupent court aux rafales de scripts.
+    _limiter = Limiter(get_remote_address, app=app)
+    _suggest_throttle = _limiter.limit("20/second")
+else:
+    def _suggest_throttle(view):
+        return view
+
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class ORJSONProvider(JSONProvider):
+        """Sérialise les réponses via orjson (C/SIMD) plutôt que json pur Python."""
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+
+@app.after_request
+def set_api_cache_headers(response):
+    # Autorise un cache aval (navigateur, microcache Nginx — voir
+    # deploy/nginx/meteo.conf.example) à resservir les réponses réussies.
+    if request.path.startswith("/api/") and response.status_code == 200:
+        response.headers["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+def _normalize_query(query: str) -> str:
+    # "Paris", "PARIS" et "Paŕis" partagent la même clé de cache : la
+    # recherche Open-Meteo ignore casse et accents, autant en profiter.
+    decomposed = unicodedata.normalize("NFKD", query)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
 
 def get_geocoding(city: str, count: int = 8) -> list[dict[str, Any]]:
+    cache_key = (_normalize_query(city.strip()), count)
+    cached = _cache_get(_geo_cache, cache_key, GEOCODING_CACHE_TTL, empty_ttl=GEOCODING_NEGATIVE_TTL)
+    if cached is not None:
+        return cached
+
+    shared_key = f"geo:{cache_key[0]}:{count}"
+    shared = _shared_cache_get(shared_key)
+    if shared is not None:
+        _cache_put(_geo_cache, cache_key, shared)
+        return shared
+
     params = {
         "name": city,
         "count": count,
         "language": "fr",
         "format": "json",
     }
-    response = requests.get(GEOCODING_URL, params=params, timeout=15)
+    response = _SESSION.get(GEOCODING_URL, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    data = response.json()
-    return data.get("results", [])
+    data = _json_loads(response.content)
+    results = data.get("results", [])
+    _cache_put(_geo_cache, cache_key, results)
+    _shared_cache_put(shared_key, GEOCODING_CACHE_TTL if results else GEOCODING_NEGATIVE_TTL, results)
+    return results
 
 
 def get_forecast(latitude: float, longitude: float) -> dict[str, Any]:
+    # Arrondi à ~100 m : la gigue GPS du navigateur retombe sur la même clé.
+    cache_key = (round(latitude, 3), round(longitude, 3))
+    cached = _cache_get(_forecast_cache, cache_key, FORECAST_CACHE_TTL)
+    if cached is not None:
+        return cached
+
+    shared_key = f"fc:{cache_key[0]}:{cache_key[1]}"
+    shared = _shared_cache_get(shared_key)
+    if shared is not None:
+        _cache_put(_forecast_cache, cache_key, shared)
+        return shared
+
     params = {
         "latitude": latitude,
         "longitude": longitude,
@@ -65,9 +342,19 @@ def get_forecast(latitude: float, longitude: float) -> dict[str, Any]:
         "timezone": "auto",
         "forecast_days": 5,
     }
-    response = requests.get(FORECAST_URL, params=params, timeout=15)
+    response = _SESSION.get(FORECAST_URL, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    forecast = _json_loads(response.content)
+    _cache_put(_forecast_cache, cache_key, forecast)
+    _shared_cache_put(shared_key, FORECAST_CACHE_TTL, forecast)
+    return forecast
+
+
+def _prefetch_forecast(latitude: float, longitude: float) -> None:
+    try:
+        get_forecast(latitude, longitude)
+    except requests.RequestException:
+        pass
 
 
 def format_place_label(place: dict[str, Any]) -> str:
@@ -79,15 +366,34 @@ def format_place_label(place: dict[str, Any]) -> str:
     return f"{name}, {country}"
 
 
+# La page d'accueil est identique pour tout le monde : rendue une seule
+# fois, puis servie comme octets précalculés avec un ETag pour les 304.
+_index_page: tuple[bytes, str] | None = None
+_index_lock = threading.Lock()
+
+
 @app.get("/")
-def home() -> str:
-    return render_template("index.html")
+def home() -> Any:
+    global _index_page
+    if _index_page is None:
+        with _index_lock:
+            if _index_page is None:
+                body = render_template("index.html").encode()
+                _index_page = (body, hashlib.sha256(body).hexdigest()[:16])
+    body, etag = _index_page
+    response = app.response_class(body, mimetype="text/html")
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 
 @app.get("/api/suggest")
+@_suggest_throttle
 def suggest() -> tuple[Any, int] | Any:
     query = request.args.get("q", "").strip()
-    if len(query) < 2:
+    # 3 caractères minimum avant d'interroger l'API ; les noms composés
+    # ("La Paz") passent dès qu'un espace est saisi. Sans aucune lettre
+    # (chiffres, ponctuation), aucune ville ne matchera de toute façon.
+    if (len(query) < 3 and " " not in query) or not any(ch.isalpha() for ch in query):
         return jsonify([])
 
     try:
@@ -95,42 +401,36 @@ def suggest() -> tuple[Any, int] | Any:
     except requests.RequestException:
         return jsonify({"error": "Impossible de récupérer les suggestions de villes."}), 502
 
-    results = []
-    for place in places:
-        results.append(
-            {
-                "label": format_place_label(place),
-                "name": place.get("name"),
-                "country": place.get("country"),
-                "admin1": place.get("admin1"),
-                "latitude": place.get("latitude"),
-                "longitude": place.get("longitude"),
-            }
-        )
+    results = [
+        {
+            "label": format_place_label(place),
+            "name": place.get("name"),
+            "country": place.get("country"),
+            "admin1": place.get("admin1"),
+            "latitude": place.get("latitude"),
+            "longitude": place.get("longitude"),
+        }
+        for place in places
+    ]
+
+    if results and results[0]["latitude"] is not None and results[0]["longitude"] is not None:
+        _PREFETCH_POOL.submit(_prefetch_forecast, results[0]["latitude"], results[0]["longitude"])
 
     return jsonify(results)
 
 
 @app.get("/api/weather")
 def weather() -> tuple[Any, int] | Any:
-    city = request.args.get("city", "").strip()
-    latitude = request.args.get("lat", type=float)
-    longitude = request.args.get("lon", type=float)
+    query = WeatherQuery.from_args(request.args)
 
-    if not city and (latitude is None or longitude is None):
+    if not query.city and not query.has_coords:
         return jsonify({"error": "Ville ou coordonnées manquantes."}), 400
 
     try:
-        if latitude is not None and longitude is not None:
-            place = {
-                "name": city or "Ville sélectionnée",
-                "country": request.args.get("country", "Pays inconnu"),
-                "admin1": request.args.get("admin1"),
-                "latitude": latitude,
-                "longitude": longitude,
-            }
+        if query.has_coords:
+            place = query.as_place()
         else:
-            places = get_geocoding(city, count=1)
+            places = get_geocoding(query.city, count=1)
             if not places:
                 return jsonify({"error": "Aucune ville trouvée."}), 404
             place = places[0]
@@ -143,41 +443,45 @@ def weather() -> tuple[Any, int] | Any:
     daily = forecast.get("daily", {})
 
     raw_current_code = current.get("weather_code")
-    current_code = raw_current_code if isinstance(raw_current_code, int) else -1
 
-    days = []
     dates = daily.get("time", [])
     max_temps = daily.get("temperature_2m_max", [])
     min_temps = daily.get("temperature_2m_min", [])
     precip_probs = daily.get("precipitation_probability_max", [])
     daily_codes = daily.get("weather_code", [])
 
-    for index, date_str in enumerate(dates):
-        raw_code = daily_codes[index] if index < len(daily_codes) else None
-        code = raw_code if isinstance(raw_code, int) else -1
-        days.append(
-            {
-                "date": date_str,
-                "weather": WEATHER_CODES.get(code, "Description indisponible"),
-                "temp_min": min_temps[index] if index < len(min_temps) else None,
-                "temp_max": max_temps[index] if index < len(max_temps) else None,
-                "rain": precip_probs[index] if index < len(precip_probs) else None,
-            }
+    # zip_longest itère en C : plus de garde d'index ni de len() par champ.
+    days = [
+        DayForecast(
+            date_str,
+            WEATHER_CODES_ARR[raw_code] if type(raw_code) is int and 0 <= raw_code < 100 else _WEATHER_FALLBACK,
+            temp_min,
+            temp_max,
+            rain,
+        )
+        for date_str, raw_code, temp_min, temp_max, rain in zip_longest(
+            dates, daily_codes, min_temps, max_temps, precip_probs
         )
+        if date_str is not None
+    ]
 
     return jsonify(
         {
             "location": format_place_label(place),
-            "current": {
-                "temperature": current.get("temperature_2m"),
-                "humidity": current.get("relative_humidity_2m"),
-                "wind": current.get("wind_speed_10m"),
-                "weather": WEATHER_CODES.get(current_code, "Description indisponible"),
-            },
+            "current": CurrentWeather(
+                current.get("temperature_2m"),
+                current.get("relative_humidity_2m"),
+                current.get("wind_speed_10m"),
+                WEATHER_CODES_ARR[raw_current_code]
+                if type(raw_current_code) is int and 0 <= raw_current_code < 100
+                else _WEATHER_FALLBACK,
+            ),
             "daily": days,
         }
     )
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Serveur de développement uniquement ; en production, utiliser
+    # gunicorn -c gunicorn_conf.py web_app:app
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1")